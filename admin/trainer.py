@@ -61,13 +61,14 @@ def _run_sentiment(texts: list[str]) -> list[dict]:
     try:
         from sentiment.finbert import get_finbert
         fb      = get_finbert()
-        results = []
-        for t in texts:
-            if not t or not str(t).strip():
-                results.append({"label": "Neutral", "score": 0.0, "confidence": 0.0})
-                continue
-            r = fb.analyze(str(t)[:512])        # FinBERT max 512 tokens
-            results.append(r)
+        results = [{"label": "Neutral", "score": 0.0, "confidence": 0.0} for _ in texts]
+
+        # One batched pass over the non-empty rows instead of a forward per row
+        idx = [i for i, t in enumerate(texts) if t and str(t).strip()]
+        # Training rows can be full articles, so use FinBERT's whole 512-token window
+        batch = fb.analyze_batch([str(texts[i]) for i in idx], max_length=512)
+        for i, r in zip(idx, batch):
+            results[i] = r
         return results
     except Exception as e:
         print(f"[Trainer] FinBERT unavailable: {e} — using VADER fallback")
@@ -77,8 +78,8 @@ def _run_sentiment(texts: list[str]) -> list[dict]:
 def _vader_fallback(texts: list[str]) -> list[dict]:
     """VADER lexicon fallback when FinBERT is unavailable."""
     try:
-        from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-        sia = SentimentIntensityAnalyzer()
+        from sentiment.scorer import get_vader
+        sia = get_vader()
         results = []
         for t in texts:
             sc = sia.polarity_scores(str(t) if t else "")
@@ -6,6 +6,7 @@ data-backed answers using real-time sentiment + FinBERT + Gemini.
 
 import json
 import re
+from functools import lru_cache
 import yfinance as yf
 from datetime import datetime
 from google import genai
@@ -38,6 +39,15 @@ CHATBOT_USER_PROMPT = """User Question: {question}
 
 Provide a helpful, data-driven answer using the market sentiment data and stock cache above."""
 
+_GEN_CONFIG = {"temperature": 0.3, "max_output_tokens": 512}
+
+
+@lru_cache(maxsize=None)
+def _shared_client(key: str):
+    """One Gemini client per API key for the whole process, so every chatbot
+    (one per Streamlit session) reuses the same connection pool."""
+    return genai.Client(api_key=key, http_options={"api_version": "v1beta"})
+
 
 class TradingChatbot:
     """
@@ -57,7 +67,7 @@ class TradingChatbot:
     def _init_clients(self):
         for key in GEMINI_API_KEYS:
             try:
-                client = genai.Client(api_key=key, http_options={"api_version": "v1beta"})
+                client = _shared_client(key)
                 self.clients.append(client)
             except Exception:
                 self.clients.append(None)
@@ -98,27 +108,102 @@ class TradingChatbot:
                     continue
                 try:
                     answer = self._gemini_response(question, market_context, ticker_context, current)
-                    self.conversation_history.append({
-                        "question": question, "answer": answer,
-                        "timestamp": datetime.now().strftime("%H:%M:%S"),
-                    })
-                    return {
-                        "answer": answer,
-                        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                        "method": "gemini",
-                        "data_used": bool(market_data or ticker_cache),
-                    }
+                    return self._reply(question, answer, "gemini", market_data, ticker_cache)
                 except Exception as e:
-                    if "RESOURCE_EXHAUSTED" in str(e) or "429" in str(e):
-                        print(f"[Chatbot] Key {self.client_index} quota exhausted — rotating...")
-                        if not self._rotate_key():
-                            break
-                    else:
-                        print(f"[Chatbot] Gemini error: {str(e)[:80]}")
+                    if not self._handle_gemini_error(e):
                         break
 
         # Rich template fallback
         answer = self._template_response(question, market_data, ticker_cache, recently_viewed)
+        return self._reply(question, answer, "template", market_data, ticker_cache)
+
+    async def aask(self, question: str, market_data: dict = None,
+                   ticker_cache: dict = None, recently_viewed: list = None) -> dict:
+        """
+        Async twin of ask() — awaits Gemini through the client's aio surface,
+        so several questions can be in flight at once (network-bound, not CPU).
+        """
+        ticker_cache    = ticker_cache or {}
+        recently_viewed = recently_viewed or []
+
+        market_context = self._build_market_context(market_data)
+        ticker_context = self._build_ticker_context(ticker_cache, recently_viewed)
+
+        if self.clients:
+            for _ in range(len(self.clients)):
+                current = self.client
+                if current is None or self.client_index in self.exhausted:
+                    if not self._rotate_key():
+                        break
+                    continue
+                try:
+                    answer = await self._agemini_response(question, market_context, ticker_context, current)
+                    return self._reply(question, answer, "gemini", market_data, ticker_cache)
+                except Exception as e:
+                    if not self._handle_gemini_error(e):
+                        break
+
+        answer = self._template_response(question, market_data, ticker_cache, recently_viewed)
+        return self._reply(question, answer, "template", market_data, ticker_cache)
+
+    def ask_stream(self, question: str, market_data: dict = None,
+                   ticker_cache: dict = None, recently_viewed: list = None):
+        """
+        Streaming twin of ask() — yields the answer in chunks as Gemini
+        produces them, so the UI can show the first words straight away.
+        The full answer is recorded in history once the stream ends, and the
+        reply dict (as from ask()) is the generator's return value.
+        """
+        ticker_cache    = ticker_cache or {}
+        recently_viewed = recently_viewed or []
+
+        market_context = self._build_market_context(market_data)
+        ticker_context = self._build_ticker_context(ticker_cache, recently_viewed)
+
+        if self.clients:
+            for _ in range(len(self.clients)):
+                current = self.client
+                if current is None or self.client_index in self.exhausted:
+                    if not self._rotate_key():
+                        break
+                    continue
+                parts = []
+                try:
+                    for chunk in current.models.generate_content_stream(
+                        model=self.model_name,
+                        contents=self._gemini_prompt(question, market_context, ticker_context),
+                        config=_GEN_CONFIG,
+                    ):
+                        if chunk.text:
+                            parts.append(chunk.text)
+                            yield chunk.text
+                    if not parts:
+                        raise ValueError("Empty Gemini response")
+                    return self._reply(question, "".join(parts), "gemini", market_data, ticker_cache)
+                except Exception as e:
+                    if parts:
+                        # Already on screen — keep what arrived rather than retry,
+                        # but flag it so callers don't treat it as a full answer
+                        return self._reply(question, "".join(parts), "gemini_partial",
+                                           market_data, ticker_cache)
+                    if not self._handle_gemini_error(e):
+                        break
+
+        answer = self._template_response(question, market_data, ticker_cache, recently_viewed)
+        yield answer
+        return self._reply(question, answer, "template", market_data, ticker_cache)
+
+    def _handle_gemini_error(self, e: Exception) -> bool:
+        """Rotate on quota errors. Returns True if another key should be tried."""
+        if "RESOURCE_EXHAUSTED" in str(e) or "429" in str(e):
+            print(f"[Chatbot] Key {self.client_index} quota exhausted — rotating...")
+            return self._rotate_key()
+        print(f"[Chatbot] Gemini error: {str(e)[:80]}")
+        return False
+
+    def _reply(self, question: str, answer: str, method: str,
+               market_data: dict, ticker_cache: dict) -> dict:
+        """Record the exchange in history and build the response dict."""
         self.conversation_history.append({
             "question": question, "answer": answer,
             "timestamp": datetime.now().strftime("%H:%M:%S"),
@@ -126,21 +211,35 @@ class TradingChatbot:
         return {
             "answer": answer,
             "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "method": "template",
+            "method": method,
             "data_used": bool(market_data or ticker_cache),
         }
 
-    def _gemini_response(self, question: str, market_context: str, ticker_context: str, client) -> str:
+    def _gemini_prompt(self, question: str, market_context: str, ticker_context: str) -> str:
         system_prompt = CHATBOT_SYSTEM_PROMPT.format(
             market_context=market_context,
             ticker_context=ticker_context,
         )
-        full_prompt = f"{system_prompt}\n\n{CHATBOT_USER_PROMPT.format(question=question)}"
+        return f"{system_prompt}\n\n{CHATBOT_USER_PROMPT.format(question=question)}"
+
+    def _gemini_response(self, question: str, market_context: str, ticker_context: str, client) -> str:
         response = client.models.generate_content(
             model=self.model_name,
-            contents=full_prompt,
-            config={"temperature": 0.3, "max_output_tokens": 512},
+            contents=self._gemini_prompt(question, market_context, ticker_context),
+            config=_GEN_CONFIG,
+        )
+        return self._response_text(response)
+
+    async def _agemini_response(self, question: str, market_context: str, ticker_context: str, client) -> str:
+        response = await client.aio.models.generate_content(
+            model=self.model_name,
+            contents=self._gemini_prompt(question, market_context, ticker_context),
+            config=_GEN_CONFIG,
         )
+        return self._response_text(response)
+
+    @staticmethod
+    def _response_text(response) -> str:
         text = response.text
         if text is None and response.candidates:
             for part in response.candidates[0].content.parts:
@@ -429,6 +429,25 @@ class TradingAPI:
             recently_viewed=self._recently_viewed,
         )
 
+    async def achat(self, question: str) -> dict:
+        """Async chat() — lets the UI await several questions concurrently."""
+        return await self._chatbot.aask(
+            question,
+            market_data=self._latest_result,
+            ticker_cache=self._ticker_analysis_cache,
+            recently_viewed=self._recently_viewed,
+        )
+
+    def chat_stream(self, question: str):
+        """Streaming chat() — yields answer text chunks as they arrive and
+        returns the chat() reply dict when exhausted."""
+        return self._chatbot.ask_stream(
+            question,
+            market_data=self._latest_result,
+            ticker_cache=self._ticker_analysis_cache,
+            recently_viewed=self._recently_viewed,
+        )
+
     def get_chat_history(self) -> list:
         """Get conversation history."""
         return self._chatbot.conversation_history
@@ -470,6 +489,10 @@ class TradingAPI:
             "timestamp": result.get("timestamp", "Never"),
         }
 
+    def get_dashboard_bootstrap(self) -> dict:
+        """Settings + dashboard data in one call — everything the dashboard page needs on entry."""
+        return {"settings": self.get_settings(), "dashboard": self.get_dashboard_data()}
+
     def get_portfolio_allocations(self) -> dict:
         """
         Compute per-ticker INR allocations using:
@@ -25,6 +25,8 @@ Unknown tickers passed to `_resolve()` are auto-registered under "Other".
 """
 
 from __future__ import annotations
+from collections import defaultdict
+from functools import lru_cache
 from typing import Optional
 
 # ── Benchmark ─────────────────────────────────────────────────────────────────
@@ -416,6 +418,10 @@ _NSE500 = _NSE500_DEDUP
 
 # ── Universe class ─────────────────────────────────────────────────────────────
 
+def _trigrams(text: str) -> set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
 class IndiaUniverse:
     """
     Manages the Indian NSE investment universe.
@@ -431,6 +437,7 @@ class IndiaUniverse:
             self._stocks = [s for s in all_stocks if s["ticker"] in set(tickers)]
         else:
             self._stocks = list(all_stocks)
+        self._tri_index: Optional[dict[str, set[int]]] = None   # built on first search()
 
     # ── Properties ───────────────────────────────────────────────────────────
 
@@ -475,15 +482,36 @@ class IndiaUniverse:
         Optionally filter by sector.  Returns up to 100 results.
         """
         q = query.strip().upper()
+        if len(q) >= 3:
+            # Only rows containing every trigram of q can contain q itself;
+            # the substring check below then confirms the (few) candidates
+            index    = self._trigram_index()
+            postings = sorted((index.get(g, ()) for g in _trigrams(q)), key=len)
+            rows     = [self._stocks[i] for i in sorted(set(postings[0]).intersection(*postings[1:]))]
+        else:
+            rows = self._stocks
+
+        sector_l = sector.lower()
         results = []
-        for s in self._stocks:
-            sector_match = (not sector) or (s["sector"].lower() == sector.lower())
+        for s in rows:
+            sector_match = (not sector) or (s["sector"].lower() == sector_l)
             if not sector_match:
                 continue
             if not q or q in s["ticker"].upper() or q in s["name"].upper():
                 results.append(s)
         return results[:100]
 
+    def _trigram_index(self) -> dict[str, set[int]]:
+        """Trigram → row indices over upper-cased tickers and names."""
+        if self._tri_index is None:
+            index: dict[str, set[int]] = defaultdict(set)
+            for i, s in enumerate(self._stocks):
+                for field in (s["ticker"].upper(), s["name"].upper()):
+                    for g in _trigrams(field):
+                        index[g].add(i)
+            self._tri_index = dict(index)
+        return self._tri_index
+
     def browse_sector(self, sector: str) -> list[dict]:
         """
         Return all companies in a given sector, sorted by name.
@@ -548,9 +576,13 @@ def search_companies(query: str) -> list[dict]:
     return IndiaUniverse().search(query)
 
 
+_EXCHANGE_SUFFIXES = (".NS", ".BO")
+
+
+@lru_cache(maxsize=2048)
 def normalise_ticker(ticker: str) -> str:
-    """Ensure ticker has .NS suffix for yfinance."""
+    """Ensure ticker has .NS suffix for yfinance (memoised — the set of tickers is small)."""
     t = ticker.strip().upper()
-    if not t.endswith(".NS") and not t.endswith(".BO") and not t.startswith("^"):
-        t = t + ".NS"
+    if not t.endswith(_EXCHANGE_SUFFIXES) and not t.startswith("^"):
+        t += ".NS"
     return t
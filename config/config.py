@@ -17,11 +17,20 @@ FINNHUB_API_KEY = os.getenv("FINNHUB_API_KEY", "")
 NEWSAPI_KEY = os.getenv("NEWSAPI_KEY", "")
 NEWSDATA_API_KEY = os.getenv("NEWSDATA_API_KEY", "")
 
+# ─── API Server ─────────────────────────────────────────────
+# Request threads in the single server process; gunicorn.config.py, the ASGI
+# adapter's pool and the 503 load-shedding limit in server.py all follow it
+SERVER_THREADS = int(os.getenv("GUNICORN_THREADS", "8"))
+
 # ─── LLM Settings ───────────────────────────────────────────
 GEMINI_MODEL = "gemini-2.0-flash"
 LLM_TEMPERATURE = 0.1  # Low temp = deterministic output
 LLM_MAX_TOKENS = 1024
 
+# ─── FinBERT Settings ───────────────────────────────────────
+# Opt-in torch.compile of the FinBERT forward pass (set TORCH_COMPILE=1)
+TORCH_COMPILE = os.getenv("TORCH_COMPILE", "") == "1"
+
 # ─── Sentiment Thresholds ───────────────────────────────────
 STRONG_BULLISH_THRESHOLD = 0.5
 STRONG_BEARISH_THRESHOLD = -0.3
@@ -0,0 +1,29 @@
+"""
+Gunicorn settings for the Flask API server.
+Run: gunicorn -c gunicorn.config.py server:app
+"""
+
+import os
+
+# A single worker process: background job trackers, response caches and the
+# TradingAPI instance live in server.py's memory, so extra processes would each
+# see different state. Concurrency comes from the thread pool instead — the
+# trading_api.* calls are I/O-bound (news APIs, Gemini, yfinance).
+workers = 1
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", "8"))   # same env as config.SERVER_THREADS
+
+bind = "0.0.0.0:5000"
+backlog = 4096          # queue bursts of React polls instead of refusing them
+keepalive = 5
+
+# Analysis and backtests run on background threads, but a slow view (chat,
+# analyze-ticker) can still take a while — don't kill the worker mid-request
+timeout = 120
+graceful_timeout = 30
+
+# FinBERT and the NSE universe are loaded once at import and shared by threads
+preload_app = True
+
+accesslog = "-"
+errorlog = "-"
@@ -3,84 +3,210 @@ Core Sentiment Analyzer — uses Gemini LLM with VADER fallback.
 Supports multiple API keys with automatic rotation on rate limits.
 """
 
+import heapq
 import json
+import re
 import time
+from collections import deque
+import httpx
+import orjson
 from google import genai
 from config.config import GEMINI_API_KEYS, GEMINI_MODEL, LLM_TEMPERATURE
-from sentiment.prompts import SENTIMENT_ANALYSIS_PROMPT, BATCH_SENTIMENT_PROMPT
+from sentiment.prompts import SENTIMENT_ANALYSIS_PROMPT, BATCH_SENTIMENT_PROMPT, BATCH_SENTIMENT_SYSTEM
 from sentiment.scorer import SentimentScorer
 from sentiment.finbert import get_finbert
 
 MAX_RETRIES = 2
 RETRY_BASE_DELAY = 5  # seconds
 BATCH_CHUNK_SIZE = 5  # smaller chunks for thinking model
+HTTP_TIMEOUT_MS = 30_000  # per Gemini request
+HTTP_MAX_KEEPALIVE = 32   # pooled connections shared across all keys
+KEY_COOLDOWN_SECONDS = 60  # per-minute rate-limited keys rejoin rotation after this
+
+# Texts with no words left once mentions, cashtags and links are stripped
+# (e.g. "RT @foo: $TSLA", "🚀🚀🚀") carry nothing for FinBERT or Gemini to read.
+# They are scored by VADER at low confidence instead of costing a model call.
+# Length alone is no signal — "TSLA up" or "Crash!" still go to the models.
+PREFILTER_CONFIDENCE = 0.1
+_NON_WORD_TOKEN_RE = re.compile(r"https?://\S+|[@$#]\w+|\bRT\b")
+_WORD_RE = re.compile(r"[^\W\d_]{2,}")
+
+
+def _has_words(text: str) -> bool:
+    return _WORD_RE.search(_NON_WORD_TOKEN_RE.sub(" ", text)) is not None
+
+
+_CODE_FENCE_RE = re.compile(r'```(?:json)?\s*\n?(.*?)```', re.DOTALL)
+_TRAILING_COMMA_RE = re.compile(r',\s*([}\]])')
+_JSON_CLOSERS = {"[": "]", "{": "}"}
+
+
+def _json_loads(text: str):
+    """Parse with orjson; fall back to stdlib json for inputs orjson rejects (e.g. NaN)."""
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        return json.loads(text)
+
+
+def _is_valid_json(text: str) -> bool:
+    try:
+        _json_loads(text)
+        return True
+    except json.JSONDecodeError:
+        return False
+
+
+def _extract_balanced(text: str, opener: str) -> str | None:
+    """
+    Return the first balanced [...] or {...} span in text, or None.
+    Single O(N) pass that tracks nesting depth and skips brackets inside strings.
+    """
+    start = text.find(opener)
+    if start == -1:
+        return None
+    closer = _JSON_CLOSERS[opener]
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == opener:
+            depth += 1
+        elif ch == closer:
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
 
 
 class GeminiKeyPool:
     """
     Manages a pool of Gemini API keys with automatic rotation.
-    When one key hits a quota limit, it switches to the next.
+    Healthy keys are served round-robin from a deque. Daily-exhausted keys
+    are dropped for good; keys hitting per-minute limits cool down and are
+    re-activated after KEY_COOLDOWN_SECONDS.
     """
 
     def __init__(self, api_keys: list[str]):
         self.keys = api_keys
         self.clients = []
-        self.current_index = 0
         self.exhausted_keys = set()  # Track daily-exhausted keys
+        self._cooldown = []          # Heap of (ready_at, index) for per-minute limits
+
+        # One keep-alive connection pool shared by every key, so chunk calls
+        # reuse warm TLS connections instead of handshaking per request
+        self.http_client = httpx.Client(
+            limits=httpx.Limits(max_keepalive_connections=HTTP_MAX_KEEPALIVE),
+            timeout=HTTP_TIMEOUT_MS / 1000,
+        )
 
         for key in self.keys:
             try:
-                client = genai.Client(
-                    api_key=key,
-                    http_options={"api_version": "v1beta"},
-                )
+                client = self._make_client(key)
                 self.clients.append(client)
             except Exception as e:
                 print(f"[WARNING] Failed to init key ...{key[-4:]}: {e}")
                 self.clients.append(None)
 
-        active = sum(1 for c in self.clients if c is not None)
-        print(f"[INFO] Gemini Key Pool: {active}/{len(self.keys)} keys active")
+        # Indices of usable keys; the head is the current key
+        self._active = deque(i for i, c in enumerate(self.clients) if c is not None)
+
+        print(f"[INFO] Gemini Key Pool: {len(self._active)}/{len(self.keys)} keys active")
+
+    def _make_client(self, key: str):
+        """Create a Gemini client bound to the shared HTTP pool."""
+        http_options = {"api_version": "v1beta", "timeout": HTTP_TIMEOUT_MS}
+        try:
+            return genai.Client(
+                api_key=key,
+                http_options={**http_options, "httpx_client": self.http_client},
+            )
+        except (TypeError, ValueError):
+            # Older google-genai without injectable clients: still pool per key
+            return genai.Client(
+                api_key=key,
+                http_options={
+                    **http_options,
+                    "client_args": {
+                        "limits": httpx.Limits(max_keepalive_connections=HTTP_MAX_KEEPALIVE),
+                    },
+                },
+            )
+
+    def _reactivate_cooled_keys(self):
+        """Move keys whose per-minute cooldown has elapsed back into rotation."""
+        now = time.monotonic()
+        while self._cooldown and self._cooldown[0][0] <= now:
+            _, index = heapq.heappop(self._cooldown)
+            self._active.append(index)
+            print(f"       [Key ...{self.keys[index][-4:]}] Cooldown over — back in rotation")
+
+    @property
+    def current_index(self) -> int | None:
+        """Index of the current key, or None if no key is usable right now."""
+        self._reactivate_cooled_keys()
+        return self._active[0] if self._active else None
 
     @property
     def current_client(self):
         """Get the current active client."""
-        if not self.clients:
-            return None
-        return self.clients[self.current_index]
+        index = self.current_index
+        return None if index is None else self.clients[index]
 
     @property
     def current_key_label(self):
         """Get a safe label for the current key (last 4 chars)."""
-        if not self.keys:
+        index = self.current_index
+        if index is None:
             return "none"
-        return f"...{self.keys[self.current_index][-4:]}"
+        return f"...{self.keys[index][-4:]}"
+
+    def advance(self):
+        """Round-robin to the next healthy key (call after a successful request)."""
+        self._active.rotate(-1)
 
     def rotate(self) -> bool:
         """
-        Rotate to the next available key.
+        Retire the current key (daily quota hit) and move to the next one.
         Returns True if a new key is available, False if all exhausted.
         """
-        self.exhausted_keys.add(self.current_index)
         print(f"       [Key {self.current_key_label}] Quota hit — rotating...")
+        if self._active:
+            self.exhausted_keys.add(self._active.popleft())
+        return self._report_next()
 
-        # Find next non-exhausted key
-        for _ in range(len(self.keys)):
-            self.current_index = (self.current_index + 1) % len(self.keys)
-            if self.current_index not in self.exhausted_keys and self.clients[self.current_index] is not None:
-                print(f"       [Switched to key {self.current_key_label}]")
-                return True
-
+    def cool_down(self) -> bool:
+        """
+        Park the current key for KEY_COOLDOWN_SECONDS (per-minute limit hit).
+        Returns True if another key is available right now.
+        """
+        print(f"       [Key {self.current_key_label}] Rate limited — cooling down {KEY_COOLDOWN_SECONDS}s...")
+        if self._active:
+            ready_at = time.monotonic() + KEY_COOLDOWN_SECONDS
+            heapq.heappush(self._cooldown, (ready_at, self._active.popleft()))
+        return self._report_next()
+
+    def _report_next(self) -> bool:
+        if self.current_index is not None:
+            print(f"       [Switched to key {self.current_key_label}]")
+            return True
         print(f"       [ALL {len(self.keys)} KEYS EXHAUSTED] Falling back to VADER.")
         return False
 
     @property
     def has_available_keys(self) -> bool:
-        """Check if any keys are still available."""
-        return any(
-            i not in self.exhausted_keys and c is not None
-            for i, c in enumerate(self.clients)
-        )
+        """Check if any key is usable right now."""
+        return self.current_index is not None
 
 
 class SentimentAnalyzer:
@@ -134,6 +260,9 @@ class SentimentAnalyzer:
         Analyze sentiment of a single text using the 3-tier pipeline.
         FinBERT → Gemini (if ambiguous) → VADER (fallback)
         """
+        if not _has_words(text):
+            return self._prefilter_results([text])[0]
+
         # Tier 1: FinBERT
         if self.finbert_available:
             try:
@@ -165,11 +294,38 @@ class SentimentAnalyzer:
     def analyze_batch(self, texts: list[str]) -> list[dict]:
         """
         Analyze multiple texts using the 3-tier pipeline.
-        FinBERT handles all → ambiguous ones escalated to Gemini → VADER fallback.
+        Wordless texts are pre-filtered to low-confidence VADER; the rest go
+        FinBERT → ambiguous ones escalated to Gemini → VADER fallback.
         """
         if not texts:
             return []
 
+        results = [None] * len(texts)
+        word_indices, skipped_indices = [], []
+        for i, t in enumerate(texts):
+            (word_indices if _has_words(t) else skipped_indices).append(i)
+
+        if skipped_indices:
+            print(f"       [Prefilter] {len(skipped_indices)}/{len(texts)} wordless texts scored by VADER")
+            skipped = self._prefilter_results([texts[i] for i in skipped_indices])
+            for i, r in zip(skipped_indices, skipped):
+                results[i] = r
+
+        if word_indices:
+            analyzed = self._analyze_batch_tiers([texts[i] for i in word_indices])
+            for i, r in zip(word_indices, analyzed):
+                results[i] = r
+        return results
+
+    def _prefilter_results(self, texts: list[str]) -> list[dict]:
+        """VADER scores for wordless texts, flagged low-confidence."""
+        results = self.scorer.vader_batch(texts)
+        for r in results:
+            r.update(confidence=PREFILTER_CONFIDENCE, method="prefilter")
+        return results
+
+    def _analyze_batch_tiers(self, texts: list[str]) -> list[dict]:
+        """Run texts through FinBERT → Gemini (ambiguous) → VADER."""
         # Tier 1: FinBERT batch analysis (fast, local)
         if self.finbert_available:
             try:
@@ -211,33 +367,27 @@ class SentimentAnalyzer:
                 print(f"       [Gemini] Batch failed: {e}. Falling back to VADER.")
 
         # Tier 3: VADER fallback
-        return [self.scorer.vader_score(t) for t in texts]
+        return self.scorer.vader_batch(texts)
 
     def analyze_news(self, news_items: list[dict]) -> list[dict]:
         """
         Analyze sentiment of ALL news headlines using FinBERT (no limit needed).
         FinBERT is local — can process all 100+ headlines in seconds.
         """
-        results = []
-        all_texts = [item["headline"] for item in news_items if item.get("headline")]
+        # Collect (item, headline) once so analysis results zip straight back
+        pairs = [(item, item["headline"]) for item in news_items if item.get("headline")]
 
         # FinBERT handles everything — no need to limit to top 15 anymore
-        sentiments = self.analyze_batch(all_texts)
-
-        text_idx = 0
-        for item in news_items:
-            if item.get("headline"):
-                if text_idx < len(sentiments):
-                    result = sentiments[text_idx]
-                    text_idx += 1
-                else:
-                    result = self.scorer.vader_score(item["headline"])
-                result["source"] = item.get("source", "Unknown")
-                result["category"] = item.get("category", "general")
-                result["type"] = "news"
-                results.append(result)
+        sentiments = self.analyze_batch([headline for _, headline in pairs])
 
-        return results
+        for (item, _), result in zip(pairs, sentiments):
+            result.update(
+                source=item.get("source", "Unknown"),
+                category=item.get("category", "general"),
+                type="news",
+            )
+
+        return sentiments
 
     def analyze_social(self, social_posts: list[dict]) -> list[dict]:
         """
@@ -249,21 +399,19 @@ class SentimentAnalyzer:
         Returns:
             List of sentiment results with platform info preserved
         """
-        results = []
-        texts = [item["post"] for item in social_posts if item.get("post")]
+        pairs = [(item, item["post"]) for item in social_posts if item.get("post")]
 
-        sentiments = self.analyze_batch(texts)
+        sentiments = self.analyze_batch([post for _, post in pairs])
 
-        for i, item in enumerate(social_posts):
-            if i < len(sentiments):
-                result = sentiments[i]
-                result["platform"] = item.get("platform", "Unknown")
-                result["ticker"] = item.get("ticker", "")
-                result["user"] = item.get("user", "")
-                result["type"] = "social"
-                results.append(result)
+        for (item, _), result in zip(pairs, sentiments):
+            result.update(
+                platform=item.get("platform", "Unknown"),
+                ticker=item.get("ticker", ""),
+                user=item.get("user", ""),
+                type="social",
+            )
 
-        return results
+        return sentiments
 
     def get_aggregate(self, news_results: list[dict], social_results: list[dict]) -> dict:
         """
@@ -281,27 +429,29 @@ class SentimentAnalyzer:
 
     # ─── Private LLM Methods ──────────────────────────────────
 
-    def _llm_call_with_retry(self, prompt: str, max_tokens: int = 256) -> str:
+    def _llm_call_with_retry(self, prompt: str, max_tokens: int = 256,
+                             system_instruction: str | None = None) -> str:
         """
         Make an LLM call with retry + key rotation on quota limits.
         If current key is exhausted, rotates to next key and retries.
+        A static system_instruction is sent separately from the per-call prompt.
         """
+        config = {
+            "temperature": LLM_TEMPERATURE,
+            "max_output_tokens": max_tokens,
+        }
+        if system_instruction:
+            config["system_instruction"] = system_instruction
+
         while self.key_pool and self.key_pool.has_available_keys:
             client = self.key_pool.current_client
-            if client is None:
-                if not self.key_pool.rotate():
-                    break
-                continue
 
             for attempt in range(MAX_RETRIES):
                 try:
                     response = client.models.generate_content(
                         model=self.model_name,
                         contents=prompt,
-                        config={
-                            "temperature": LLM_TEMPERATURE,
-                            "max_output_tokens": max_tokens,
-                        },
+                        config=config,
                     )
                     # gemini-2.5-flash (thinking model) may have text in candidates
                     text = response.text
@@ -312,6 +462,7 @@ class SentimentAnalyzer:
                                 break
                     if text is None:
                         raise ValueError("Empty response from Gemini")
+                    self.key_pool.advance()
                     return text
                 except Exception as e:
                     error_str = str(e)
@@ -329,8 +480,8 @@ class SentimentAnalyzer:
                     else:
                         raise e
             else:
-                # All retries exhausted on this key → rotate
-                if not self.key_pool.rotate():
+                # Still rate limited after retries → cool this key down, try the next
+                if not self.key_pool.cool_down():
                     raise RuntimeError("ALL_KEYS_EXHAUSTED")
 
         raise RuntimeError("ALL_KEYS_EXHAUSTED")
@@ -357,16 +508,18 @@ class SentimentAnalyzer:
 
             # If LLM already failed (daily limit), skip straight to VADER
             if llm_failed_permanently:
-                all_results.extend([self.scorer.vader_score(t) for t in chunk])
+                all_results.extend(self.scorer.vader_batch(chunk))
                 continue
 
             print(f"       [LLM] Processing chunk {chunk_num}/{total_chunks} ({len(chunk)} items)...")
 
-            numbered_texts = "\n".join([f"{j+1}. \"{t}\"" for j, t in enumerate(chunk)])
+            numbered_texts = "\n".join(f'{j}. "{t}"' for j, t in enumerate(chunk, 1))
             prompt = BATCH_SENTIMENT_PROMPT.format(texts=numbered_texts)
 
             try:
-                response_text = self._llm_call_with_retry(prompt, max_tokens=4096)
+                response_text = self._llm_call_with_retry(
+                    prompt, max_tokens=4096, system_instruction=BATCH_SENTIMENT_SYSTEM
+                )
                 results = self._parse_llm_batch_response(response_text)
 
                 if len(results) >= len(chunk):
@@ -378,8 +531,7 @@ class SentimentAnalyzer:
                         r["method"] = "Gemini"
                     all_results.extend(results)
                     # Pad with VADER for any missing
-                    for j in range(len(results), len(chunk)):
-                        all_results.append(self.scorer.vader_score(chunk[j]))
+                    all_results.extend(self.scorer.vader_batch(chunk[len(results):]))
 
                 # Small delay between chunks to avoid rate limits
                 if i + BATCH_CHUNK_SIZE < len(texts):
@@ -392,41 +544,34 @@ class SentimentAnalyzer:
                     print(f"       [All Gemini keys exhausted] Switching to VADER for all remaining.")
                 else:
                     print(f"       [WARNING] Chunk {chunk_num} LLM failed: {type(e).__name__}: {error_str[:200]}. Using VADER.")
-                all_results.extend([self.scorer.vader_score(t) for t in chunk])
+                all_results.extend(self.scorer.vader_batch(chunk))
 
         return all_results
 
     def _clean_llm_json(self, response_text: str) -> str:
         """Clean LLM response to extract valid JSON."""
-        import re
         cleaned = response_text.strip()
-        
+
+        # Fast path: the model followed instructions and returned bare JSON
+        if _is_valid_json(cleaned):
+            return cleaned
+
         # Remove markdown code blocks (```json ... ``` or ``` ... ```)
-        match = re.search(r'```(?:json)?\s*\n?(.*?)```', cleaned, re.DOTALL)
+        match = _CODE_FENCE_RE.search(cleaned)
         if match:
             cleaned = match.group(1).strip()
-        
+
         # Remove any trailing commas before } or ]
-        cleaned = re.sub(r',\s*([}\]])', r'\1', cleaned)
-        
-        # Fix common issues: single quotes -> double quotes
-        # Only if it won't break valid JSON
-        try:
-            json.loads(cleaned)
+        cleaned = _TRAILING_COMMA_RE.sub(r'\1', cleaned)
+        if _is_valid_json(cleaned):
             return cleaned
-        except json.JSONDecodeError:
-            pass
-        
+
         # Try to find JSON array or object in the text
-        for pattern in [r'(\[.*\])', r'(\{.*\})']:
-            match = re.search(pattern, cleaned, re.DOTALL)
-            if match:
-                try:
-                    json.loads(match.group(1))
-                    return match.group(1)
-                except json.JSONDecodeError:
-                    continue
-        
+        for opener in "[{":
+            candidate = _extract_balanced(cleaned, opener)
+            if candidate and _is_valid_json(candidate):
+                return candidate
+
         return cleaned
 
     def _parse_llm_response(self, response_text: str) -> dict:
@@ -434,7 +579,7 @@ class SentimentAnalyzer:
         cleaned = self._clean_llm_json(response_text)
 
         try:
-            data = json.loads(cleaned)
+            data = _json_loads(cleaned)
             return {
                 "sentiment": data.get("sentiment", "Neutral"),
                 "score": float(data.get("score", 0.0)),
@@ -447,7 +592,7 @@ class SentimentAnalyzer:
         """Parse a batch JSON array response from LLM."""
         cleaned = self._clean_llm_json(response_text)
 
-        data = json.loads(cleaned)
+        data = _json_loads(cleaned)
         if not isinstance(data, list):
             raise ValueError("Expected JSON array")
 
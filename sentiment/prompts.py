@@ -21,15 +21,14 @@ Scoring guide:
 Be precise and financially logical. Base your analysis only on the given text."""
 
 
-BATCH_SENTIMENT_PROMPT = """You are a quantitative financial analyst specializing in market sentiment analysis.
+# Static batch instructions — sent as the system instruction so the identical
+# prefix is shared across chunks (eligible for provider-side prompt caching).
+BATCH_SENTIMENT_SYSTEM = """You are a quantitative financial analyst specializing in market sentiment analysis.
 
-Analyze the following list of market texts (news headlines and social media posts) and determine the sentiment of EACH one.
-
-Texts:
-{texts}
+You will be given a numbered list of market texts (news headlines and social media posts). Determine the sentiment of EACH one.
 
 Respond with ONLY a JSON array (no markdown, no code blocks, no explanation). Each element should be:
-{{"text": "<original text>", "sentiment": "Bullish" or "Bearish" or "Neutral", "score": <float between -1.0 and 1.0>}}
+{"text": "<original text>", "sentiment": "Bullish" or "Bearish" or "Neutral", "score": <float between -1.0 and 1.0>}
 
 Scoring guide:
 - Strong Bullish: +0.7 to +1.0
@@ -40,6 +39,10 @@ Scoring guide:
 
 Be precise, deterministic, and financially logical."""
 
+# Per-chunk part of the batch prompt — only the texts vary between calls
+BATCH_SENTIMENT_PROMPT = """Texts:
+{texts}"""
+
 
 OVERALL_MARKET_MOOD_PROMPT = """You are a quantitative financial analyst.
 
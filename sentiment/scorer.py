@@ -3,14 +3,27 @@ Sentiment Scorer — aggregates individual sentiment scores into an overall mark
 Also provides a VADER-based fallback for offline / no-API scenarios.
 """
 
+from collections import Counter
+
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 
 
+_vader_instance = None
+
+
+def get_vader() -> SentimentIntensityAnalyzer:
+    """Get or create the shared VADER analyzer (lexicon is parsed once per process)."""
+    global _vader_instance
+    if _vader_instance is None:
+        _vader_instance = SentimentIntensityAnalyzer()
+    return _vader_instance
+
+
 class SentimentScorer:
     """Handles scoring and aggregation of sentiment results."""
 
     def __init__(self):
-        self.vader = SentimentIntensityAnalyzer()
+        self.vader = get_vader()
 
     def vader_score(self, text: str) -> dict:
         """
@@ -22,9 +35,16 @@ class SentimentScorer:
         Returns:
             Dict with sentiment label and score
         """
-        scores = self.vader.polarity_scores(text)
-        compound = scores["compound"]  # Range: -1 to +1
+        compound = self.vader.polarity_scores(text)["compound"]  # Range: -1 to +1
+        return self._vader_result(text, compound)
+
+    def vader_batch(self, texts: list[str]) -> list[dict]:
+        """VADER fallback for many texts, reusing one bound polarity_scores lookup."""
+        polarity = self.vader.polarity_scores
+        return [self._vader_result(t, polarity(t)["compound"]) for t in texts]
 
+    @staticmethod
+    def _vader_result(text: str, compound: float) -> dict:
         if compound >= 0.3:
             sentiment = "Bullish"
         elif compound <= -0.3:
@@ -59,12 +79,17 @@ class SentimentScorer:
                 "neutral_count": 0,
             }
 
-        scores = [r.get("score", 0.0) for r in results]
-        avg_score = round(sum(scores) / len(scores), 4)
+        # Single pass: accumulate score total and label counts together
+        score_total = 0.0
+        counts = Counter()
+        for r in results:
+            score_total += r.get("score", 0.0)
+            counts[r.get("sentiment")] += 1
+        avg_score = round(score_total / len(results), 4)
 
-        bullish = sum(1 for r in results if r.get("sentiment") == "Bullish")
-        bearish = sum(1 for r in results if r.get("sentiment") == "Bearish")
-        neutral = sum(1 for r in results if r.get("sentiment") == "Neutral")
+        bullish = counts["Bullish"]
+        bearish = counts["Bearish"]
+        neutral = counts["Neutral"]
 
         if avg_score >= 0.3:
             overall = "Bullish"
@@ -1,52 +1,380 @@
 """
 Flask API server — bridges React frontend to Python backend.
-Run: python server.py
+Run: gunicorn -c gunicorn.config.py server:app
+ or: uvicorn server:asgi_app --port 5000 --loop uvloop --http httptools
+Dev: FLASK_DEV=1 python server.py
 Serves at: http://localhost:5000
 """
 
-from flask import Flask, request, jsonify
+from a2wsgi import WSGIMiddleware
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from flask import Flask, Response, g, request
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.exceptions import BadRequest
+from flask_compress import Compress
 from flask_cors import CORS
 from api import TradingAPI
+from backtest.report import RESULTS_DIR, compare_runs, delete_result, list_runs, load_result
+from backtest.runner import run_backtest
+from backtest.universe_india import IndiaUniverse, normalise_ticker
+from config.config import SERVER_THREADS
+import brotli
+import gzip
+import hashlib
+import orjson
+import ormsgpack
+import os
 import threading
+import time
+import zstandard
 
 app = Flask(__name__)
 CORS(app)  # Allow React dev server (localhost:5173) to call this
 
+
+# ─── JSON (orjson) ────────────────────────────────────────────
+
+_ORJSON_OPTS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _orjson_default(obj):
+    """Fallback for types orjson can't serialise natively (like json's default=str)."""
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    return str(obj)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson — used by request.get_json() too."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=_orjson_default, option=_ORJSON_OPTS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+app.json = OrjsonProvider(app)
+
+
+def ojsonify(obj, status: int = 200):
+    """jsonify() replacement that writes orjson bytes straight into the response."""
+    return app.response_class(
+        orjson.dumps(obj, default=_orjson_default, option=_ORJSON_OPTS),
+        status=status,
+        mimetype="application/json",
+    )
+
+
+def _body_json() -> dict:
+    """Parse a POST body straight from bytes with orjson; empty or non-object bodies read as {}."""
+    raw = request.get_data(cache=False)
+    if not raw:
+        return {}
+    try:
+        data = orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        raise BadRequest("Malformed JSON body")
+    return data if isinstance(data, dict) else {}
+
+
+# ─── Content Negotiation (msgpack) ────────────────────────────
+# Heavy numeric payloads (backtests, dashboard) can be requested as msgpack
+# with `Accept: application/msgpack`; JSON stays the default for everyone else.
+
+MSGPACK_MIMETYPE = "application/msgpack"
+_ORMSGPACK_OPTS  = ormsgpack.OPT_NON_STR_KEYS | ormsgpack.OPT_SERIALIZE_NUMPY
+
+
+def _wants_msgpack() -> bool:
+    best = request.accept_mimetypes.best_match(["application/json", MSGPACK_MIMETYPE])
+    return best == MSGPACK_MIMETYPE
+
+
+def _encode(obj, msgpack: bool) -> bytes:
+    if msgpack:
+        return ormsgpack.packb(obj, default=_orjson_default, option=_ORMSGPACK_OPTS)
+    return orjson.dumps(obj, default=_orjson_default, option=_ORJSON_OPTS)
+
+
+def _bytes_response(body: bytes, msgpack: bool, status: int = 200):
+    resp = app.response_class(
+        body,
+        status=status,
+        mimetype=MSGPACK_MIMETYPE if msgpack else "application/json",
+    )
+    resp.vary.add("Accept")
+    return resp
+
+
+def negotiate(obj, status: int = 200):
+    """ojsonify() counterpart that answers in msgpack when the client asks for it."""
+    msgpack = _wants_msgpack()
+    return _bytes_response(_encode(obj, msgpack), msgpack, status)
+
+
+# ─── Compression ──────────────────────────────────────────────
+# Dynamic responses are compressed on the fly by flask-compress. Static
+# payloads are pre-compressed once at import (at max level, since it's free)
+# and flask-compress skips anything that already has a Content-Encoding.
+
+COMPRESS_MIN_SIZE = 1024
+_ENCODING_PREFERENCE = ("zstd", "br", "gzip")
+
+app.config.update(
+    COMPRESS_ALGORITHM  = list(_ENCODING_PREFERENCE),
+    COMPRESS_MIMETYPES  = ["application/json", MSGPACK_MIMETYPE],
+    COMPRESS_MIN_SIZE   = COMPRESS_MIN_SIZE,
+    COMPRESS_LEVEL      = 5,   # gzip
+    COMPRESS_BR_LEVEL   = 5,
+    COMPRESS_ZSTD_LEVEL = 5,
+)
+Compress(app)
+
+_PRECOMPRESSORS = {
+    "zstd": lambda b: zstandard.ZstdCompressor(level=19).compress(b),
+    "br":   lambda b: brotli.compress(b, quality=11),
+    "gzip": lambda b: gzip.compress(b, compresslevel=9),
+}
+
+
+def _precompress(body: bytes) -> dict[str, bytes]:
+    """Encoded variants of a static body, keyed by Content-Encoding."""
+    if len(body) < COMPRESS_MIN_SIZE:
+        return {}
+    return {enc: fn(body) for enc, fn in _PRECOMPRESSORS.items()}
+
+
+def _precompressed_json(body: bytes, variants: dict[str, bytes]):
+    """Response carrying the best pre-compressed variant the client accepts."""
+    resp = Response(body, mimetype="application/json")
+    resp.vary.add("Accept-Encoding")
+    accepted = request.accept_encodings
+    enc = next((e for e in _ENCODING_PREFERENCE if e in variants and e in accepted), None)
+    if enc is not None:
+        resp.set_data(variants[enc])
+        resp.headers["Content-Encoding"] = enc
+    return resp, enc
+
+
+# ─── Response Cache ───────────────────────────────────────────
+# Idempotent GETs whose payloads only change when something is POSTed or a
+# background analysis finishes — their rendered bytes are reused until then.
+# (/api/portfolio/allocations is left out: it stamps datetime.now() per call.)
+# Registered before the overload guard, so a hit is answered without a slot.
+_CACHEABLE_GETS = frozenset({
+    "/api/settings",
+    "/api/result",
+    "/api/dashboard",
+    "/api/chat/history",
+})
+_resp_cache_lock = threading.Lock()
+_resp_cache: dict[tuple, tuple[bytes, str]] = {}
+_resp_cache_gen = 0   # bumped on invalidation so in-flight renders aren't stored stale
+
+
+def _resp_cache_key() -> tuple:
+    return (request.path, request.query_string, _wants_msgpack())
+
+
+def _invalidate_responses():
+    global _resp_cache_gen
+    with _resp_cache_lock:
+        _resp_cache_gen += 1
+        _resp_cache.clear()
+
+
+@app.before_request
+def _serve_cached_response():
+    if request.method != "GET" or request.path not in _CACHEABLE_GETS:
+        return None
+    hit = _resp_cache.get(_resp_cache_key())
+    if hit is not None:
+        body, mimetype = hit
+        resp = Response(body, mimetype=mimetype)
+        resp.vary.add("Accept")
+        return resp
+    g.resp_cache_gen = _resp_cache_gen
+    return None
+
+
+@app.after_request
+def _store_or_invalidate_response(resp):
+    if request.method in ("POST", "PUT", "DELETE"):
+        _invalidate_responses()
+    elif "resp_cache_gen" in g and resp.status_code == 200:
+        with _resp_cache_lock:
+            if g.resp_cache_gen == _resp_cache_gen:
+                _resp_cache[_resp_cache_key()] = (resp.get_data(), resp.mimetype)
+    return resp
+
+
+# ─── Overload Protection ──────────────────────────────────────
+# Cap in-flight requests and shed the excess with 503 instead of thrashing.
+# Cheap polling endpoints are exempt so the UI can always see job progress.
+# One request thread is held back from the cap, so when every other thread is
+# stuck in a slow view the last one can still answer polls and shed the rest
+# (a cap at or above the thread count could never be reached).
+MAX_INFLIGHT = max(SERVER_THREADS - 1, 1)
+_INFLIGHT = threading.BoundedSemaphore(MAX_INFLIGHT)
+_INFLIGHT_EXEMPT = frozenset({
+    "/api/health",
+    "/api/analyze/status",
+    "/api/backtest/status",
+    "/api/admin/train/status",
+})
+
+
+@app.before_request
+def _acquire_slot():
+    if request.path in _INFLIGHT_EXEMPT:
+        return None
+    if not _INFLIGHT.acquire(blocking=False):
+        resp = ojsonify({"error": "Server busy, please retry"}, status=503)
+        resp.headers["Retry-After"] = "1"
+        return resp
+    g.inflight_slot = True
+    return None
+
+
+@app.teardown_request
+def _release_slot(exc=None):
+    # teardown runs even when the view raised, so a slot can never leak
+    if g.pop("inflight_slot", False):
+        _INFLIGHT.release()
+
+
 # Singleton API instance (persists across requests)
 trading_api = TradingAPI()
 
+# Static NSE universe — built once at import instead of per request
+_UNIVERSE = IndiaUniverse()
+
+# sector (case-folded) → stocks, so by-sector lookups are a dict hit, not a scan
+_BY_SECTOR = defaultdict(list)
+for _stock in _UNIVERSE.stocks:
+    _BY_SECTOR[_stock["sector"].casefold()].append(_stock)
+_SECTOR_KEYS = frozenset(_BY_SECTOR)
+_BY_SECTOR_BYTES = {k: orjson.dumps(v) for k, v in _BY_SECTOR.items()}
+_BY_SECTOR_ENCODED = {k: _precompress(v) for k, v in _BY_SECTOR_BYTES.items()}
+
+_SECTORS_BYTES = orjson.dumps({
+    "sectors": _UNIVERSE.sectors(),
+    "counts":  {name: len(_BY_SECTOR[name.casefold()]) for name in _UNIVERSE.sectors()},
+})
+_ALL_COMPANIES_BYTES = orjson.dumps(_UNIVERSE.stocks)
+_SECTORS_ETAG        = hashlib.blake2b(_SECTORS_BYTES, digest_size=16).hexdigest()
+_ALL_COMPANIES_ETAG  = hashlib.blake2b(_ALL_COMPANIES_BYTES, digest_size=16).hexdigest()
+_SECTORS_ENCODED       = _precompress(_SECTORS_BYTES)
+_ALL_COMPANIES_ENCODED = _precompress(_ALL_COMPANIES_BYTES)
+_STATIC_MAX_AGE      = 3600
+
+
+def _static_json(body: bytes, etag: str, variants: dict[str, bytes]):
+    """Serve pre-serialised JSON; answers 304 when the client's ETag matches."""
+    resp, enc = _precompressed_json(body, variants)
+    # Each encoding is a distinct representation, so it gets its own ETag
+    resp.set_etag(f"{etag}-{enc}" if enc else etag)
+    resp.cache_control.public  = True
+    resp.cache_control.max_age = _STATIC_MAX_AGE
+    return resp.make_conditional(request)
+
+
+# ─── Async Job Helpers ────────────────────────────────────────
+
+class _JobTracker:
+    """
+    One background-job slot: a long-lived single-worker pool, the Future of
+    the current run, and its pre-rendered status JSON.
+
+    The status body is re-rendered only on transitions (submit, progress,
+    completion), so the ~1 s UI polls just hand back ready-made bytes.
+    """
+
+    def __init__(self, name: str, done_msg: str, extra=None, **meta):
+        self._pool        = ThreadPoolExecutor(max_workers=1, thread_name_prefix=name)
+        self._submit_lock = threading.Lock()   # guards check-and-submit
+        self._render_lock = threading.Lock()   # last render always sees latest state
+        self._done_msg    = done_msg
+        self._extra       = extra              # result-or-None → extra status keys
+        self.future: Future | None = None
+        self.progress     = ""
+        self.meta         = meta
+        self.status_bytes = b""
+        self._render()
+
+    def is_running(self) -> bool:
+        fut = self.future
+        return fut is not None and not fut.done()
+
+    def submit(self, fn, *args, progress: str = "Queued…", **meta) -> bool:
+        """Start fn(*args) unless a run is in progress. Returns False if busy."""
+        with self._submit_lock:
+            if self.is_running():
+                return False
+            self.progress = progress
+            self.meta.update(meta)
+            fut = self.future = self._pool.submit(fn, *args)
+        self._render()
+        fut.add_done_callback(lambda _: self._render())
+        return True
+
+    def set_progress(self, msg: str):
+        self.progress = msg
+        self._render()
+
+    def result(self):
+        """Return value of the last run, or None if it hasn't completed cleanly."""
+        fut = self.future
+        if fut is None or not fut.done() or fut.exception() is not None:
+            return None
+        return fut.result()
+
+    def snapshot(self) -> dict:
+        fut = self.future
+        if fut is None:
+            snap = {"status": "idle", "progress": "", "error": None}
+        elif not fut.done():
+            snap = {"status": "running", "progress": self.progress, "error": None}
+        elif fut.exception() is not None:
+            snap = {"status": "error", "progress": "", "error": str(fut.exception())}
+        else:
+            snap = {"status": "complete", "progress": self._done_msg, "error": None}
+        snap.update(self.meta)
+        if self._extra is not None:
+            snap.update(self._extra(self.result()))
+        return snap
+
+    def _render(self):
+        with self._render_lock:
+            self.status_bytes = orjson.dumps(
+                self.snapshot(), default=_orjson_default, option=_ORJSON_OPTS
+            )
+
+    def status_response(self):
+        return Response(self.status_bytes, mimetype="application/json")
+
+
 # ─── Async Analysis Job Tracker ───────────────────────────────
-_job_lock = threading.Lock()
-_job = {
-    "status": "idle",      # idle | running | complete | error
-    "progress": "",
-    "error": None,
-}
+_analysis_job = _JobTracker("analysis", "Analysis complete")
 
 
 def _run_analysis_bg(use_mock: bool):
-    """Background thread: run analysis + update _job on finish."""
-    global _job
+    """Pool worker: run analysis; errors surface through the Future."""
+    _analysis_job.set_progress("Fetching news & social data…")
     try:
-        with _job_lock:
-            _job["progress"] = "Fetching news & social data…"
-        result = trading_api.run_analysis(use_mock=use_mock)
-        with _job_lock:
-            _job["status"] = "complete"
-            _job["progress"] = "Analysis complete"
-            _job["error"] = None
-    except Exception as e:
-        with _job_lock:
-            _job["status"] = "error"
-            _job["progress"] = ""
-            _job["error"] = str(e)
+        trading_api.run_analysis(use_mock=use_mock)
+    finally:
+        _invalidate_responses()
 
 
 # ─── Health Check ─────────────────────────────────────────────
 
 @app.route("/api/health", methods=["GET"])
 def health():
-    return jsonify({"status": "ok", "message": "SentXStock API is running"})
+    return ojsonify({"status": "ok", "message": "SentXStock API is running"})
 
 
 # ─── Indian Company Universe ───────────────────────────────────
@@ -61,23 +389,22 @@ def search_companies():
     - If q is provided → text search, optionally filtered by sector
     - Returns: { results: [...], total: N, sector: str, query: str }
     """
-    from backtest.universe_india import IndiaUniverse
     q      = request.args.get("q", "").strip()
     sector = request.args.get("sector", "").strip()
 
-    u = IndiaUniverse()
+    u = _UNIVERSE
 
     if not q and sector:
         # Browse mode: return all companies in a sector (sorted by name)
         companies = u.browse_sector(sector)
     elif not q:
         # No query and no sector → return empty so search box stays clean
-        return jsonify({"results": [], "total": 0, "sector": sector, "query": q})
+        return ojsonify({"results": [], "total": 0, "sector": sector, "query": q})
     else:
         # Text search with optional sector filter
         companies = u.search(q, sector=sector)
 
-    return jsonify({
+    return ojsonify({
         "results": companies,
         "total":   len(companies),
         "sector":  sector,
@@ -88,77 +415,67 @@ def search_companies():
 @app.route("/api/companies/sectors", methods=["GET"])
 def get_sectors():
     """List all sector names with company count."""
-    from backtest.universe_india import IndiaUniverse
-    u = IndiaUniverse()
-    sector_names = u.sectors()
-    counts = {s: 0 for s in sector_names}
-    for stock in u.stocks:
-        counts[stock["sector"]] = counts.get(stock["sector"], 0) + 1
-    return jsonify({
-        "sectors": sector_names,
-        "counts":  counts,
-    })
+    return _static_json(_SECTORS_BYTES, _SECTORS_ETAG, _SECTORS_ENCODED)
 
 
 @app.route("/api/companies/by-sector/<sector>", methods=["GET"])
 def companies_by_sector(sector: str):
     """Return all companies in a given sector."""
-    from backtest.universe_india import IndiaUniverse
-    u = IndiaUniverse()
-    stocks = [s for s in u.stocks if s["sector"].lower() == sector.lower()]
-    return jsonify(stocks)
+    key = sector.casefold()
+    if key not in _SECTOR_KEYS:
+        return Response(b"[]", mimetype="application/json")
+    resp, _ = _precompressed_json(_BY_SECTOR_BYTES[key], _BY_SECTOR_ENCODED[key])
+    return resp
 
 
 @app.route("/api/companies/all", methods=["GET"])
 def get_all_companies():
     """Return all 500 NSE companies (ticker, name, sector)."""
-    from backtest.universe_india import IndiaUniverse
-    return jsonify(IndiaUniverse().stocks)
+    return _static_json(_ALL_COMPANIES_BYTES, _ALL_COMPANIES_ETAG, _ALL_COMPANIES_ENCODED)
 
 
 @app.route("/api/companies/info/<ticker>", methods=["GET"])
 def company_info(ticker: str):
     """Return metadata for a single ticker."""
-    from backtest.universe_india import IndiaUniverse, normalise_ticker
     t = normalise_ticker(ticker)
-    u = IndiaUniverse()
+    u = _UNIVERSE
     info = u.info(t)
     if info is None:
         # Not in universe — still return basic info
-        return jsonify({
+        return ojsonify({
             "ticker":    t,
             "name":      t.replace(".NS", ""),
             "sector":    "Unknown",
             "in_universe": False,
         })
     info["in_universe"] = True
-    return jsonify(info)
+    return ojsonify(info)
 
 
 # ─── User Settings ────────────────────────────────────────────
 
 @app.route("/api/settings", methods=["GET"])
 def get_settings():
-    return jsonify(trading_api.get_settings())
+    return ojsonify(trading_api.get_settings())
 
 
 @app.route("/api/settings/tickers", methods=["POST"])
 def set_tickers():
-    data = request.get_json()
+    data = _body_json()
     tickers = data.get("tickers", [])
     if isinstance(tickers, str):
         tickers = [t.strip() for t in tickers.split(",") if t.strip()]
     result = trading_api.set_user_tickers(tickers)
-    return jsonify(result)
+    return ojsonify(result)
 
 
 @app.route("/api/settings/portfolio", methods=["POST"])
 def set_portfolio():
-    data = request.get_json()
+    data = _body_json()
     cash = data.get("cash", 50000)
     risk = data.get("risk", "Moderate")
     result = trading_api.set_user_portfolio(cash=float(cash), risk=risk)
-    return jsonify(result)
+    return ojsonify(result)
 
 
 # ─── Analysis ─────────────────────────────────────────────────
@@ -166,45 +483,35 @@ def set_portfolio():
 @app.route("/api/analyze", methods=["POST"])
 def run_analysis():
     """Start the analysis pipeline in a background thread (non-blocking)."""
-    global _job
-    data = request.get_json() or {}
+    data = _body_json()
     use_mock = data.get("mock", False)
 
-    with _job_lock:
-        if _job["status"] == "running":
-            return jsonify({"status": "running", "message": "Analysis already in progress"})
-        _job["status"] = "running"
-        _job["progress"] = "Starting pipeline…"
-        _job["error"] = None
-
-    t = threading.Thread(target=_run_analysis_bg, args=(use_mock,), daemon=True)
-    t.start()
-    return jsonify({"status": "started"})
+    if not _analysis_job.submit(_run_analysis_bg, use_mock, progress="Starting pipeline…"):
+        return ojsonify({"status": "running", "message": "Analysis already in progress"})
+    return ojsonify({"status": "started"})
 
 
 @app.route("/api/analyze/status", methods=["GET"])
 def analyze_status():
     """Poll this endpoint to check if analysis has finished."""
-    with _job_lock:
-        snapshot = dict(_job)
-    return jsonify(snapshot)
+    return _analysis_job.status_response()
 
 
 @app.route("/api/analyze/ticker", methods=["POST"])
 def analyze_ticker():
     """Deep-dive analysis on a specific ticker."""
-    data = request.get_json()
+    data = _body_json()
     ticker = data.get("ticker", "")
     if not ticker:
-        return jsonify({"error": "Please provide a ticker"}), 400
+        return ojsonify({"error": "Please provide a ticker"}, status=400)
     result = trading_api.analyze_ticker(ticker)
-    return jsonify(result)
+    return ojsonify(result)
 
 
 @app.route("/api/result", methods=["GET"])
 def get_latest_result():
     """Get the most recent analysis result (cached)."""
-    return jsonify(trading_api.get_latest_result())
+    return ojsonify(trading_api.get_latest_result())
 
 
 # ─── Dashboard ────────────────────────────────────────────────
@@ -212,7 +519,7 @@ def get_latest_result():
 @app.route("/api/dashboard", methods=["GET"])
 def get_dashboard():
     """Get all dashboard data in one call."""
-    return jsonify(trading_api.get_dashboard_data())
+    return negotiate(trading_api.get_dashboard_data())
 
 
 # ─── Portfolio Allocations ────────────────────────────────────
@@ -220,14 +527,14 @@ def get_dashboard():
 @app.route("/api/portfolio/allocations", methods=["GET"])
 def get_portfolio_allocations():
     """Return INR-denominated per-ticker allocation plan."""
-    return jsonify(trading_api.get_portfolio_allocations())
+    return ojsonify(trading_api.get_portfolio_allocations())
 
 
 @app.route("/api/portfolio/analyze-all", methods=["POST"])
 def analyze_portfolio_tickers():
     """Run sentiment analysis on all watchlist tickers and cache results."""
     result = trading_api.analyze_portfolio_tickers()
-    return jsonify(result)
+    return ojsonify(result)
 
 
 # ─── Chatbot ──────────────────────────────────────────────────
@@ -235,155 +542,172 @@ def analyze_portfolio_tickers():
 @app.route("/api/chat", methods=["POST"])
 def chat():
     """Ask the AI trading advisor a question."""
-    data = request.get_json()
+    data = _body_json()
     question = data.get("question", "")
     if not question:
-        return jsonify({"error": "Please provide a question"}), 400
+        return ojsonify({"error": "Please provide a question"}, status=400)
     result = trading_api.chat(question)
-    return jsonify(result)
+    return ojsonify(result)
 
 
 @app.route("/api/chat/history", methods=["GET"])
 def chat_history():
     """Get conversation history."""
-    return jsonify(trading_api.get_chat_history())
+    return ojsonify(trading_api.get_chat_history())
 
 
 @app.route("/api/chat/clear", methods=["POST"])
 def clear_chat():
     """Clear conversation history."""
     trading_api.clear_chat()
-    return jsonify({"success": True})
+    return ojsonify({"success": True})
 
 
 # ─── Backtesting ──────────────────────────────────────────────
 
-_bt_job_lock = threading.Lock()
-_bt_job = {
-    "status":  "idle",   # idle | running | complete | error
-    "progress": "",
-    "error":    None,
-    "run_id":   None,
-}
-
-
-def _run_backtest_bg(params: dict):
-    """Background thread for running backtest (same async pattern as analysis)."""
-    global _bt_job
-    try:
-        from backtest.runner import run_backtest
-
-        with _bt_job_lock:
-            _bt_job["progress"] = "Loading price data…"
-
-        result = run_backtest(
-            tickers            = params.get("tickers") or None,
-            sector             = params.get("sector") or None,
-            start              = params.get("start",  "2022-01-01"),
-            end                = params.get("end",    "2024-01-01"),
-            strategy_variant   = params.get("strategy_variant",  "threshold"),
-            risk_level         = params.get("risk_level",        "Medium"),
-            sentiment_mode     = params.get("sentiment_mode",    "price_momentum"),
-            buy_threshold      = float(params.get("buy_threshold",  0.10)),
-            sell_threshold     = float(params.get("sell_threshold", -0.10)),
-            max_position_pct   = float(params.get("max_position_pct", 0.05)),
-            initial_capital    = float(params.get("initial_capital",  100_000)),
-            benchmark_ticker   = params.get("benchmark_ticker", "^NSEI"),
-            slippage_bps       = float(params.get("slippage_bps", 5.0)),
-            allow_shorts       = bool(params.get("allow_shorts", False)),
-            max_open_positions = int(params.get("max_open_positions", 20)),
-            save_results       = True,
-            run_id             = params.get("run_id") or None,
-            verbose            = False,
-        )
-
-        with _bt_job_lock:
-            _bt_job["status"]   = "complete"
-            _bt_job["progress"] = "Backtest complete"
-            _bt_job["run_id"]   = result.to_dict().get("_run_id", "")
-            _bt_job["result"]   = result.to_dict()
-            _bt_job["error"]    = None
-
-    except Exception as e:
-        import traceback
-        with _bt_job_lock:
-            _bt_job["status"]   = "error"
-            _bt_job["progress"] = ""
-            _bt_job["error"]    = str(e)
-            _bt_job["run_id"]   = None
+_bt_job = _JobTracker(
+    "backtest", "Backtest complete",
+    extra=lambda r: {"run_id": r.get("_run_id", "") if r else None},
+)
+
+
+def _run_backtest_bg(params: dict) -> dict:
+    """Pool worker for a backtest (same Future-based pattern as analysis)."""
+    _bt_job.set_progress("Loading price data…")
+
+    result = run_backtest(
+        tickers            = params.get("tickers") or None,
+        sector             = params.get("sector") or None,
+        start              = params.get("start",  "2022-01-01"),
+        end                = params.get("end",    "2024-01-01"),
+        strategy_variant   = params.get("strategy_variant",  "threshold"),
+        risk_level         = params.get("risk_level",        "Medium"),
+        sentiment_mode     = params.get("sentiment_mode",    "price_momentum"),
+        buy_threshold      = float(params.get("buy_threshold",  0.10)),
+        sell_threshold     = float(params.get("sell_threshold", -0.10)),
+        max_position_pct   = float(params.get("max_position_pct", 0.05)),
+        initial_capital    = float(params.get("initial_capital",  100_000)),
+        benchmark_ticker   = params.get("benchmark_ticker", "^NSEI"),
+        slippage_bps       = float(params.get("slippage_bps", 5.0)),
+        allow_shorts       = bool(params.get("allow_shorts", False)),
+        max_open_positions = int(params.get("max_open_positions", 20)),
+        save_results       = True,
+        run_id             = params.get("run_id") or None,
+        verbose            = False,
+    )
+    _invalidate_run_caches()
+    return result.to_dict()
+
+
+def _submit_backtest(params: dict, busy_message: str):
+    """Queue a backtest unless one is already running."""
+    if not _bt_job.submit(_run_backtest_bg, params):
+        return ojsonify({"status": "running", "message": busy_message})
+    return ojsonify({"status": "started"})
 
 
 @app.route("/api/backtest/run", methods=["POST"])
 def start_backtest():
     """Start a backtest in a background thread (non-blocking)."""
-    global _bt_job
-    params = request.get_json() or {}
-
-    with _bt_job_lock:
-        if _bt_job["status"] == "running":
-            return jsonify({"status": "running", "message": "Backtest already in progress"})
-        _bt_job["status"]   = "running"
-        _bt_job["progress"] = "Queued…"
-        _bt_job["error"]    = None
-        _bt_job["run_id"]   = None
-        _bt_job.pop("result", None)
-
-    t = threading.Thread(target=_run_backtest_bg, args=(params,), daemon=True)
-    t.start()
-    return jsonify({"status": "started"})
+    params = _body_json()
+    return _submit_backtest(params, "Backtest already in progress")
 
 
 @app.route("/api/backtest/status", methods=["GET"])
 def backtest_status():
     """Poll for backtest completion."""
-    with _bt_job_lock:
-        snapshot = {k: v for k, v in _bt_job.items() if k != "result"}
-    return jsonify(snapshot)
+    return _bt_job.status_response()
 
 
 @app.route("/api/backtest/latest", methods=["GET"])
 def backtest_latest_result():
     """Return the full result of the most-recently-completed backtest."""
-    with _bt_job_lock:
-        r = _bt_job.get("result")
+    r = _bt_job.result()
     if not r:
-        return jsonify({"error": "No completed backtest in memory. Call /api/backtest/result/<run_id> instead."}), 404
-    return jsonify(r)
+        return ojsonify({"error": "No completed backtest in memory. Call /api/backtest/result/<run_id> instead."}, status=404)
+    msgpack = _wants_msgpack()
+    return _bytes_response(_latest_bt_bytes(_bt_job.future, msgpack), msgpack)
+
+
+@lru_cache(maxsize=2)
+def _latest_bt_bytes(fut: Future, msgpack: bool) -> bytes:
+    """Render a finished backtest once per format; keyed on its Future so a new run re-renders."""
+    return _encode(fut.result(), msgpack)
+
+
+# Saved runs rarely change, so rendered results are memoised per (run_id, mtime)
+# and the run listing is re-scanned only when the results dir changes or the
+# short TTL lapses (catches in-place overwrites, which don't touch dir mtime).
+_LIST_RUNS_TTL = 5.0
+_list_runs_lock = threading.Lock()
+_list_runs_cache = {"mtime": None, "at": 0.0, "bytes": b""}
+
+
+@lru_cache(maxsize=256)
+def _result_bytes_cached(run_id: str, mtime_ns: int, msgpack: bool) -> bytes:
+    # Re-encoded rather than served raw: files written by json.dump may hold
+    # NaN/Infinity tokens, which orjson turns into valid JSON nulls
+    return _encode(load_result(run_id), msgpack)
+
+
+def _result_bytes(run_id: str, msgpack: bool = False) -> bytes:
+    try:
+        mtime_ns = (RESULTS_DIR / f"{run_id}.json").stat().st_mtime_ns
+    except OSError:
+        raise FileNotFoundError(f"No saved result for run_id='{run_id}'")
+    return _result_bytes_cached(run_id, mtime_ns, msgpack)
+
+
+def _list_runs_bytes() -> bytes:
+    mtime = RESULTS_DIR.stat().st_mtime_ns
+    now   = time.monotonic()
+    with _list_runs_lock:
+        c = _list_runs_cache
+        if c["mtime"] != mtime or now - c["at"] > _LIST_RUNS_TTL:
+            c["bytes"] = orjson.dumps(list_runs(), default=_orjson_default, option=_ORJSON_OPTS)
+            c["mtime"] = mtime
+            c["at"]    = now
+        return c["bytes"]
+
+
+def _invalidate_run_caches():
+    _result_bytes_cached.cache_clear()
+    with _list_runs_lock:
+        _list_runs_cache["mtime"] = None
 
 
 @app.route("/api/backtest/results", methods=["GET"])
 def list_backtest_results():
     """List all saved backtest runs."""
-    from backtest.report import list_runs
-    return jsonify(list_runs())
+    return Response(_list_runs_bytes(), mimetype="application/json")
 
 
 @app.route("/api/backtest/result/<run_id>", methods=["GET"])
 def get_backtest_result(run_id: str):
     """Load a saved backtest result by run_id."""
-    from backtest.report import load_result
     try:
-        return jsonify(load_result(run_id))
+        msgpack = _wants_msgpack()
+        return _bytes_response(_result_bytes(run_id, msgpack), msgpack)
     except FileNotFoundError:
-        return jsonify({"error": f"run_id '{run_id}' not found"}), 404
+        return ojsonify({"error": f"run_id '{run_id}' not found"}, status=404)
 
 
 @app.route("/api/backtest/compare", methods=["POST"])
 def compare_backtest_results():
     """Compare multiple saved runs side by side."""
-    from backtest.report import compare_runs
-    run_ids = (request.get_json() or {}).get("run_ids", [])
+    run_ids = _body_json().get("run_ids", [])
     if not run_ids:
-        return jsonify({"error": "provide run_ids list"}), 400
-    return jsonify(compare_runs(run_ids))
+        return ojsonify({"error": "provide run_ids list"}, status=400)
+    return ojsonify(compare_runs(run_ids))
 
 
 @app.route("/api/backtest/result/<run_id>", methods=["DELETE"])
 def delete_backtest_result(run_id: str):
     """Delete a saved run."""
-    from backtest.report import delete_result
     deleted = delete_result(run_id)
-    return jsonify({"deleted": deleted})
+    if deleted:
+        _invalidate_run_caches()
+    return ojsonify({"deleted": deleted})
 
 
 @app.route("/api/backtest/run-ticker", methods=["POST"])
@@ -393,11 +717,10 @@ def start_backtest_for_ticker():
     Called automatically by the Dashboard when a company is selected.
     User never sees this — result is injected as a Performance Summary card.
     """
-    global _bt_job
-    data   = request.get_json() or {}
+    data   = _body_json()
     ticker = data.get("ticker", "").strip()
     if not ticker:
-        return jsonify({"error": "ticker required"}), 400
+        return ojsonify({"error": "ticker required"}, status=400)
 
     # Read user capital + risk preference from current settings
     try:
@@ -426,19 +749,8 @@ def start_backtest_for_ticker():
         "save_results":       True,
     }
 
-    with _bt_job_lock:
-        if _bt_job["status"] == "running":
-            # A backtest is already running — client can poll /api/backtest/status
-            return jsonify({"status": "running", "message": "Already in progress"})
-        _bt_job["status"]   = "running"
-        _bt_job["progress"] = "Queued…"
-        _bt_job["error"]    = None
-        _bt_job["run_id"]   = None
-        _bt_job.pop("result", None)
-
-    t = threading.Thread(target=_run_backtest_bg, args=(params,), daemon=True)
-    t.start()
-    return jsonify({"status": "started"})
+    # If a backtest is already running the client can poll /api/backtest/status
+    return _submit_backtest(params, "Already in progress")
 
 
 # ══════════════════════════════════════════════════════════════
@@ -465,12 +777,12 @@ def _require_admin():
 def admin_login():
     """Validate credentials and return a signed admin token."""
     from admin.auth import check_credentials, generate_token
-    data     = request.get_json() or {}
+    data     = _body_json()
     username = data.get("username", "").strip()
     password = data.get("password", "").strip()
     if not check_credentials(username, password):
-        return jsonify({"error": "Invalid username or password"}), 401
-    return jsonify({"token": generate_token(), "admin": username})
+        return ojsonify({"error": "Invalid username or password"}, status=401)
+    return ojsonify({"token": generate_token(), "admin": username})
 
 
 @app.route("/api/admin/verify", methods=["GET"])
@@ -478,8 +790,8 @@ def admin_verify():
     """Check if the caller's token is still valid."""
     err, code = _require_admin()
     if err:
-        return jsonify(err), code
-    return jsonify({"valid": True})
+        return ojsonify(err, status=code)
+    return ojsonify({"valid": True})
 
 
 # ── Dataset management ─────────────────────────────────────────
@@ -488,9 +800,9 @@ def admin_verify():
 def admin_list_datasets():
     err, code = _require_admin()
     if err:
-        return jsonify(err), code
+        return ojsonify(err, status=code)
     from admin.dataset_manager import list_datasets
-    return jsonify(list_datasets())
+    return ojsonify(list_datasets())
 
 
 @app.route("/api/admin/datasets/upload", methods=["POST"])
@@ -498,12 +810,12 @@ def admin_upload_dataset():
     """Accept multipart/form-data with file + metadata fields."""
     err, code = _require_admin()
     if err:
-        return jsonify(err), code
+        return ojsonify(err, status=code)
 
     from admin.dataset_manager import save_dataset
 
     if "file" not in request.files:
-        return jsonify({"error": "No file part in request"}), 400
+        return ojsonify({"error": "No file part in request"}, status=400)
 
     f            = request.files["file"]
     company      = request.form.get("company", "Unknown").strip()
@@ -512,7 +824,7 @@ def admin_upload_dataset():
     description  = request.form.get("description", "").strip()
 
     if not f.filename:
-        return jsonify({"error": "Empty filename"}), 400
+        return ojsonify({"error": "Empty filename"}, status=400)
 
     try:
         meta = save_dataset(
@@ -523,110 +835,87 @@ def admin_upload_dataset():
             period_to    = period_to,
             description  = description,
         )
-        return jsonify(meta), 201
+        return ojsonify(meta, status=201)
     except ValueError as e:
-        return jsonify({"error": str(e)}), 422
+        return ojsonify({"error": str(e)}, status=422)
     except Exception as e:
-        return jsonify({"error": f"Upload failed: {e}"}), 500
+        return ojsonify({"error": f"Upload failed: {e}"}, status=500)
 
 
 @app.route("/api/admin/datasets/<dataset_id>", methods=["GET"])
 def admin_get_dataset(dataset_id: str):
     err, code = _require_admin()
     if err:
-        return jsonify(err), code
+        return ojsonify(err, status=code)
     from admin.dataset_manager import get_dataset
     meta = get_dataset(dataset_id)
     if not meta:
-        return jsonify({"error": "Dataset not found"}), 404
-    return jsonify(meta)
+        return ojsonify({"error": "Dataset not found"}, status=404)
+    return ojsonify(meta)
 
 
 @app.route("/api/admin/datasets/<dataset_id>", methods=["DELETE"])
 def admin_delete_dataset(dataset_id: str):
     err, code = _require_admin()
     if err:
-        return jsonify(err), code
+        return ojsonify(err, status=code)
     from admin.dataset_manager import delete_dataset
     deleted = delete_dataset(dataset_id)
-    return jsonify({"deleted": deleted})
+    return ojsonify({"deleted": deleted})
 
 
 # ── Training ───────────────────────────────────────────────────
 
-_train_job_lock = threading.Lock()
-_train_job: dict = {"status": "idle", "progress": "", "error": None, "dataset_id": None}
-
+_train_job = _JobTracker(
+    "training", "Training complete",
+    extra=lambda r: {"result_id": r} if r else {},
+    dataset_id=None,
+)
 
-def _run_training_bg(dataset_id: str):
-    global _train_job
-    try:
-        from admin.dataset_manager import load_dataframe, get_dataset, mark_trained
-        from admin.trainer import train_dataset
-
-        with _train_job_lock:
-            _train_job["progress"] = "Loading dataset…"
 
-        meta = get_dataset(dataset_id)
-        df   = load_dataframe(dataset_id)
+def _run_training_bg(dataset_id: str) -> str:
+    """Pool worker: train on a dataset and return its result_id."""
+    from admin.dataset_manager import load_dataframe, get_dataset, mark_trained
+    from admin.trainer import train_dataset
 
-        with _train_job_lock:
-            _train_job["progress"] = f"Running analysis on {len(df)} rows…"
+    _train_job.set_progress("Loading dataset…")
 
-        result = train_dataset(
-            dataset_id = dataset_id,
-            company    = meta.get("company", "Unknown"),
-            df         = df,
-        )
-        mark_trained(dataset_id, result["result_id"])
+    meta = get_dataset(dataset_id)
+    df   = load_dataframe(dataset_id)
 
-        with _train_job_lock:
-            _train_job["status"]     = "complete"
-            _train_job["progress"]   = "Training complete"
-            _train_job["error"]      = None
-            _train_job["result_id"]  = result["result_id"]
+    _train_job.set_progress(f"Running analysis on {len(df)} rows…")
 
-    except Exception as e:
-        import traceback
-        with _train_job_lock:
-            _train_job["status"]   = "error"
-            _train_job["progress"] = ""
-            _train_job["error"]    = str(e)
+    result = train_dataset(
+        dataset_id = dataset_id,
+        company    = meta.get("company", "Unknown"),
+        df         = df,
+    )
+    mark_trained(dataset_id, result["result_id"])
+    return result["result_id"]
 
 
 @app.route("/api/admin/train/<dataset_id>", methods=["POST"])
 def admin_train_dataset(dataset_id: str):
     """Start training on a dataset in a background thread."""
-    global _train_job
     err, code = _require_admin()
     if err:
-        return jsonify(err), code
+        return ojsonify(err, status=code)
 
     from admin.dataset_manager import get_dataset
     if not get_dataset(dataset_id):
-        return jsonify({"error": "Dataset not found"}), 404
+        return ojsonify({"error": "Dataset not found"}, status=404)
 
-    with _train_job_lock:
-        if _train_job["status"] == "running":
-            return jsonify({"status": "running", "message": "Another training job is in progress"}), 409
-        _train_job["status"]     = "running"
-        _train_job["progress"]   = "Queued…"
-        _train_job["error"]      = None
-        _train_job["dataset_id"] = dataset_id
-        _train_job.pop("result_id", None)
-
-    t = threading.Thread(target=_run_training_bg, args=(dataset_id,), daemon=True)
-    t.start()
-    return jsonify({"status": "started", "dataset_id": dataset_id})
+    if not _train_job.submit(_run_training_bg, dataset_id, dataset_id=dataset_id):
+        return ojsonify({"status": "running", "message": "Another training job is in progress"}, status=409)
+    return ojsonify({"status": "started", "dataset_id": dataset_id})
 
 
 @app.route("/api/admin/train/status", methods=["GET"])
 def admin_train_status():
     err, code = _require_admin()
     if err:
-        return jsonify(err), code
-    with _train_job_lock:
-        return jsonify(dict(_train_job))
+        return ojsonify(err, status=code)
+    return _train_job.status_response()
 
 
 # ── Results (public — user-facing) ────────────────────────────
@@ -635,7 +924,7 @@ def admin_train_status():
 def admin_list_results():
     """Public endpoint — no auth required. Users see training results."""
     from admin.trainer import list_results
-    return jsonify(list_results())
+    return ojsonify(list_results())
 
 
 @app.route("/api/admin/results/<dataset_id>", methods=["GET"])
@@ -644,15 +933,29 @@ def admin_get_result(dataset_id: str):
     from admin.trainer import load_result
     r = load_result(dataset_id)
     if not r:
-        return jsonify({"error": "No result found for this dataset"}), 404
-    return jsonify(r)
+        return ojsonify({"error": "No result found for this dataset"}, status=404)
+    return ojsonify(r)
+
+
+# ─── ASGI entry point ─────────────────────────────────────────
+# Lets Uvicorn (uvloop + httptools) own the sockets and keep-alive handling;
+# each request runs the sync Flask view on one of a2wsgi's pool threads, sized
+# like gunicorn's (asgiref's WsgiToAsgi would run every request on one thread).
+# Keep a single worker — job trackers and TradingAPI state live in-process.
+
+asgi_app = WSGIMiddleware(app, workers=SERVER_THREADS)
 
 
 # ─── Run Server ───────────────────────────────────────────────
 
 if __name__ == "__main__":
+    if os.environ.get("FLASK_DEV") != "1":
+        raise SystemExit(
+            "Use a production server:  gunicorn -c gunicorn.config.py server:app\n"
+            "or set FLASK_DEV=1 to run the Flask development server."
+        )
     print("\n" + "=" * 50)
-    print("  SentXStock API Server")
+    print("  SentXStock API Server (development)")
     print("  http://localhost:5000")
     print("=" * 50 + "\n")
     app.run(debug=False, port=5000, use_reloader=False, threaded=True)
@@ -0,0 +1,42 @@
+"""Cached reads from the session's TradingAPI, shared by the Streamlit pages."""
+
+from uuid import uuid4
+
+import streamlit as st
+
+
+# st.cache_data is process-wide, so every entry is keyed on a random
+# per-session token (an id() can be reused once a session's api is garbage
+# collected); the leading underscore keeps Streamlit from hashing the
+# TradingAPI object itself. The version ints move on every settings save /
+# analysis run in that session, so a write invalidates only its own entries
+# (in O(1), by key) instead of clearing every session's cache.
+
+@st.cache_data(ttl=300, max_entries=256, show_spinner=False)
+def _cached_settings(_api, sid, settings_version):
+    return _api.get_settings()
+
+
+@st.cache_data(ttl=300, max_entries=256, show_spinner=False)
+def _cached_bootstrap(_api, sid, settings_version, analysis_count):
+    return _api.get_dashboard_bootstrap()
+
+
+def session_id() -> str:
+    """Random token that identifies this browser session for process-wide caches."""
+    return st.session_state.setdefault("sid", uuid4().hex)
+
+
+def get_settings(api) -> dict:
+    """api.get_settings(), memoised until the session next saves settings."""
+    return _cached_settings(api, session_id(), st.session_state.get("settings_version", 0))
+
+
+def get_dashboard_bootstrap(api) -> dict:
+    """api.get_dashboard_bootstrap() — settings and dashboard data in one
+    memoised call, so entering the dashboard costs a single fetch."""
+    return _cached_bootstrap(
+        api, session_id(),
+        st.session_state.get("settings_version", 0),
+        st.session_state.get("analysis_count", 0),
+    )
@@ -1,11 +1,67 @@
 """Chat page — AI trading advisor using native Streamlit chat."""
 
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
 import streamlit as st
 from datetime import datetime
 
+from st_pages import _data
+
+# Gemini calls are network-bound: run queued prompts concurrently, but cap
+# how many are in flight so a burst stays inside the per-minute quota
+MAX_CONCURRENT_CHATS = 8
+
+# Only the newest messages are re-rendered on every rerun; older ones move to
+# an archive that is rendered only when the user asks for it
+MAX_VISIBLE_MSGS = 100
+
+# Complete Gemini answers are reused for identical questions against the same
+# analysis result and settings, so repeated suggestion taps skip Gemini entirely
+CHAT_CACHE_TTL = 600      # seconds
+CHAT_CACHE_SIZE = 256
+
+_SUGGESTIONS = [
+    ("📊", "What is the overall market sentiment right now?"),
+    ("💰", "Should I buy AAPL at the current price?"),
+    ("⚖️", "Explain my current portfolio allocation"),
+    ("⚠️", "What are the biggest market risks today?"),
+]
+
+# (session id, question, result timestamp, settings version) -> (expires_at,
+# Future[str]); the Future lets a duplicate question wait on the in-flight
+# call. Sessions run on their own script threads, so every read and write
+# goes through the lock
+_answer_cache: dict[tuple, tuple[float, Future]] = {}
+_answer_cache_lock = threading.Lock()
+
+# One event loop for the whole process, run forever on a daemon thread. The
+# shared Gemini clients' aio sessions are bound to the loop that first used
+# them, so every achat must run here rather than on a per-rerun asyncio.run()
+_loop = asyncio.new_event_loop()
+threading.Thread(target=_loop.run_forever, name="chat-loop", daemon=True).start()
+_chat_sem = asyncio.Semaphore(MAX_CONCURRENT_CHATS)   # process-wide, lives on _loop
+
+_AVATARS = {"user": "👤", "assistant": "🤖"}
+
 
 def render_chat():
     api = st.session_state.api
+    if not isinstance(st.session_state.chat_msgs, deque):
+        st.session_state.chat_msgs = deque(st.session_state.chat_msgs, maxlen=MAX_VISIBLE_MSGS)
+    archive = st.session_state.setdefault("chat_archive", [])
+    pending = st.session_state.setdefault("chat_pending", [])
+
+    # Suggestion chips only queue their prompt; everything queued is answered
+    # together so N prompts cost max-of-latencies instead of sum-of-latencies
+    if pending:
+        with st.spinner("Thinking…"):
+            _send_many(api, pending)
+        pending.clear()
+
     msgs = st.session_state.chat_msgs
 
     # ── Header ────────────────────────────────────────
@@ -21,77 +77,190 @@ def render_chat():
         )
     with h_right:
         if st.button("Clear Chat", use_container_width=True):
-            st.session_state.chat_msgs = []
+            st.session_state.chat_msgs = deque(maxlen=MAX_VISIBLE_MSGS)
+            st.session_state.chat_archive = []
+            st.session_state.chat_pending = []
             api.clear_chat()
             st.rerun()
 
-    st.markdown("")
-
     # ── Empty state with suggestions ──────────────────
     if not msgs:
-        st.markdown("")
         st.markdown("""
-        <div style="text-align:center; padding:30px 0 20px; color:#636e7b;">
+        <div style="text-align:center; padding:58px 0 20px; color:#636e7b;">
             <div style="font-size:13px; color:#4b5563;">Ask a question to get started</div>
         </div>
         """, unsafe_allow_html=True)
 
-        suggestions = [
-            ("📊", "What is the overall market sentiment right now?"),
-            ("💰", "Should I buy AAPL at the current price?"),
-            ("⚖️", "Explain my current portfolio allocation"),
-            ("⚠️", "What are the biggest market risks today?"),
-        ]
         cols = st.columns(2)
-        for i, (icon, text) in enumerate(suggestions):
+        for i, (icon, text) in enumerate(_SUGGESTIONS):
             with cols[i % 2]:
                 if st.button(f"{icon}  {text}", key=f"sug_{i}", use_container_width=True):
-                    _send(api, text)
+                    pending.append(text)
                     st.rerun()
         return
 
     # ── Conversation ──────────────────────────────────
+    # The archive is only rendered on request, so a long chat still re-renders
+    # at most MAX_VISIBLE_MSGS messages per rerun
+    if archive and st.toggle(f"Show {len(archive)} earlier messages", key="chat_show_archive"):
+        for msg in archive:
+            _render(msg)
     for msg in msgs:
-        role = msg["role"]
-        with st.chat_message("user" if role == "user" else "assistant",
-                             avatar="👤" if role == "user" else "🤖"):
-            st.markdown(msg["text"])
+        _render(msg)
 
     # ── Chat input ────────────────────────────────────
     if prompt := st.chat_input("Ask about sentiment, tickers, strategy…"):
         # Show user message immediately
-        with st.chat_message("user", avatar="👤"):
-            st.markdown(prompt)
-        st.session_state.chat_msgs.append({"role": "user", "text": prompt})
-
-        # Get + show assistant response
-        with st.chat_message("assistant", avatar="🤖"):
-            with st.spinner("Thinking…"):
-                try:
-                    resp = api.chat(prompt)
-                    answer = resp.get("answer", resp.get("response", "No response."))
-                except Exception as e:
-                    answer = f"Sorry, something went wrong: {e}"
-            st.markdown(answer)
-        st.session_state.chat_msgs.append({"role": "assistant", "text": answer})
-
-
-def _send(api, text):
-    """Queue a message (for suggestion chip clicks)."""
-    st.session_state.chat_msgs.append({"role": "user", "text": text})
+        user_msg = _message("user", prompt)
+        _render(user_msg)
+        _append(user_msg)
+
+        # Stream the assistant response into its message as chunks arrive
+        with st.chat_message("assistant", avatar=_AVATARS["assistant"]):
+            answer = _stream_answer(api, prompt, st.empty())
+        _append(_message("assistant", answer))
+
+
+def _append(msg):
+    """Append to the visible history, archiving whatever the deque evicts."""
+    msgs = st.session_state.chat_msgs
+    if len(msgs) == msgs.maxlen:
+        st.session_state.chat_archive.append(msgs[0])
+    msgs.append(msg)
+
+
+def _send_many(api, texts):
+    """Answer queued messages concurrently, appending Q/A pairs in queue order."""
+    answers = _answer_all(api, texts)
+    for text, answer in zip(texts, answers):
+        _append(_message("user", text))
+        _append(_message("assistant", answer))
+
+
+def _answer_all(api, texts) -> list[str]:
+    """Fire every prompt at once via api.achat on the shared loop and wait for all answers."""
+    # Keys read session_state, so they're built here on the script thread
+    keys = [_cache_key(api, t) for t in texts]
+
+    async def gather():
+        return await asyncio.gather(*(_answer(api, t, k) for t, k in zip(texts, keys)))
+
+    return asyncio.run_coroutine_threadsafe(gather(), _loop).result()
+
+
+def _stream_answer(api, text, placeholder) -> str:
+    """Render the answer to `text` into `placeholder` chunk by chunk."""
+    key = _cache_key(api, text)
+    hit = _lookup(key)
+    if hit is not None:
+        answer = hit.result()
+        placeholder.markdown(answer)
+        return answer
+
+    parts, resp = [], {}
+
+    def stream():
+        # chat_stream's return value is the reply dict, method included
+        resp.update((yield from api.chat_stream(text)) or {})
+
     try:
-        resp = api.chat(text)
-        answer = resp.get("answer", resp.get("response", "No response."))
+        for chunk in stream():
+            parts.append(chunk)
+            placeholder.markdown("".join(parts))
     except Exception as e:
-        answer = f"Sorry, something went wrong: {e}"
-    st.session_state.chat_msgs.append({"role": "assistant", "text": answer})
+        if not parts:
+            answer = f"Sorry, something went wrong: {e}"
+            placeholder.markdown(answer)
+            return answer
 
+    answer = "".join(parts)
+    # Template fallbacks and streams cut off mid-answer are not worth reusing
+    if resp.get("method") == "gemini":
+        fut = Future()
+        fut.set_result(answer)
+        _store(key, fut)
+    return answer
 
-def _escape(text):
-    """Basic HTML escape."""
+
+def _cache_key(api, text) -> tuple:
     return (
-        text.replace("&", "&amp;")
-        .replace("<", "&lt;")
-        .replace(">", "&gt;")
-        .replace("\n", "<br>")
+        _data.session_id(), text,
+        (api.get_latest_result() or {}).get("timestamp"),
+        st.session_state.get("settings_version", 0),
     )
+
+
+async def _answer(api, text, key) -> str:
+    """Cached answer for `text`, calling Gemini only on a miss."""
+    fut, owner = _claim(key)
+    if not owner:
+        return await asyncio.wrap_future(fut)
+
+    try:
+        # aask rotates keys and falls back to a template itself, so it has no
+        # retry loop here; this only guards unexpected errors
+        async with _chat_sem:
+            resp = await api.achat(text)
+        answer = resp.get("answer", "No response.")
+        if resp.get("method") != "gemini":
+            _discard(key, fut)    # only complete Gemini answers are reused
+    except Exception as e:
+        _discard(key, fut)    # never cache failures
+        answer = f"Sorry, something went wrong: {e}"
+    fut.set_result(answer)
+    return answer
+
+
+def _lookup(key) -> Future | None:
+    with _answer_cache_lock:
+        hit = _answer_cache.get(key)
+    if hit is not None and hit[0] > time.monotonic():
+        return hit[1]
+    return None
+
+
+def _claim(key) -> tuple[Future, bool]:
+    """The live Future under `key`, or a new one stored there (owner=True) —
+    checked and inserted under one lock so duplicates share one Gemini call."""
+    now = time.monotonic()
+    with _answer_cache_lock:
+        hit = _answer_cache.get(key)
+        if hit is not None and hit[0] > now:
+            return hit[1], False
+        fut = Future()
+        _put(key, fut, now)
+        return fut, True
+
+
+def _store(key, fut):
+    with _answer_cache_lock:
+        _put(key, fut, time.monotonic())
+
+
+def _put(key, fut, now):
+    # Caller holds _answer_cache_lock
+    if len(_answer_cache) >= CHAT_CACHE_SIZE:
+        for k in [k for k, (expires, _) in _answer_cache.items() if expires <= now]:
+            del _answer_cache[k]
+        while len(_answer_cache) >= CHAT_CACHE_SIZE:
+            del _answer_cache[next(iter(_answer_cache))]    # oldest first
+    _answer_cache[key] = (now + CHAT_CACHE_TTL, fut)
+
+
+def _discard(key, fut):
+    """Drop `key` unless another call has already replaced `fut` under it."""
+    with _answer_cache_lock:
+        hit = _answer_cache.get(key)
+        if hit is not None and hit[1] is fut:
+            del _answer_cache[key]
+
+
+def _message(role, text) -> dict:
+    return {"role": role, "text": text}
+
+
+def _render(msg):
+    """One history entry as a native chat message — Gemini's markdown (lists,
+    headings, code, links) renders as markdown, with the role's avatar."""
+    with st.chat_message(msg["role"], avatar=_AVATARS[msg["role"]]):
+        st.markdown(msg["text"])
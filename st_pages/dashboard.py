@@ -1,7 +1,14 @@
 """Dashboard page — main analysis view with charts."""
 
+import hashlib
+import string
+from functools import lru_cache
+from typing import NamedTuple
+
+import orjson
 import streamlit as st
-import plotly.graph_objects as go
+
+from st_pages import _data
 
 
 # ── Plotly defaults ───────────────────────────────────
@@ -18,25 +25,139 @@ _YELLOW = "#d29922"
 _GRAY = "#8b949e"
 _PURPLE = "#a371f7"
 
+# Risk level (either case) -> (name, description, colour)
+_RISK_MAP = {
+    **dict.fromkeys(("high", "High"), ("High", "Aggressive positioning", _RED)),
+    **dict.fromkeys(("medium", "Medium"), ("Medium", "Balanced exposure", _BLUE)),
+    **dict.fromkeys(("low", "Low"), ("Low", "Defensive posture", _GREEN)),
+}
+_PILL_CLS = {"BUY": "sx-pill-buy", "SELL": "sx-pill-sell", "HOLD": "sx-pill-hold"}
+
+
+_BASE_LAYOUT_DICT = {
+    "plot_bgcolor": _PLOT_BG,
+    "paper_bgcolor": _PAPER_BG,
+    "font": _FONT,
+    "margin": {"l": 0, "r": 0, "t": 0, "b": 0},
+    "showlegend": False,
+    "height": 220,
+}
+
+
+def _base_layout(**kw) -> dict:
+    """Reusable Plotly layout, as a plain dict — fig.update_layout(**...)
+    takes it directly without building and validating a go.Layout first."""
+    return {**_BASE_LAYOUT_DICT, **kw}
+
+
+# ── HTML templates ────────────────────────────────────
+# Built once at import; colour constants are baked in and the render path
+# only substitutes the per-result values ($$ is a literal dollar sign)
+
+_GAUGE_TMPL = string.Template("""
+<div class="sx-card sx-row-gap">
+    <div class="sx-card-label">Market Sentiment</div>
+    <div style="display:flex; align-items:baseline; gap:10px;">
+        <div class="sx-score" style="color:$color">$score_sign$score</div>
+        <div class="sx-score-label" style="color:$color">$label</div>
+    </div>
+    <div class="sx-gauge-track" style="background:$fill_grad; margin-top:22px;">
+        <div class="sx-gauge-needle" style="left:$pct%; background:$color;"></div>
+    </div>
+    <div class="sx-gauge-ticks">
+        <span>-1.0 Bearish</span>
+        <span>0.0</span>
+        <span>+1.0 Bullish</span>
+    </div>
+    <div style="margin-top:14px; font-size:12px; color:#636e7b;">
+        Based on $total headlines from Finnhub, NewsAPI & Reddit · $ts
+    </div>
+</div>
+""")
+
+_RISK_TMPL = string.Template("""
+<div class="sx-card sx-row-gap" style="height:100%;">
+    <div class="sx-card-label">Risk Level</div>
+    <div class="sx-risk-badge" style="color:$color; background:${color}18; margin-bottom:10px;">
+        <span style="width:10px; height:10px; background:$color; border-radius:50%; display:inline-block;"></span>
+        $name
+    </div>
+    <div style="font-size:13px; color:#8b949e; margin-bottom:6px;">$desc</div>
+    <div style="font-size:12px; color:#4b5563; line-height:1.5;">$text</div>
+</div>
+""")
+
+_ALLOC_TMPL = string.Template(f"""
+<div class="sx-card sx-row-gap" style="height:100%;">
+    <div class="sx-card-label">Target Allocation</div>
+    <div class="sx-alloc-bar">
+        <div style="width:$equity%; background:{_BLUE}; border-radius:5px 0 0 5px;"></div>
+        <div style="width:$bonds%; background:{_PURPLE};"></div>
+        <div style="width:$cash%; background:#2d333b; border-radius:0 5px 5px 0;"></div>
+    </div>
+    <div style="display:flex; gap:20px; flex-wrap:wrap;">
+        <div class="sx-alloc-item">
+            <div class="sx-alloc-dot" style="background:{_BLUE};"></div>
+            Equity <span class="sx-alloc-pct">$equity_fmt%</span>
+        </div>
+        <div class="sx-alloc-item">
+            <div class="sx-alloc-dot" style="background:{_PURPLE};"></div>
+            Bonds <span class="sx-alloc-pct">$bonds_fmt%</span>
+        </div>
+        <div class="sx-alloc-item">
+            <div class="sx-alloc-dot" style="background:#2d333b;"></div>
+            Cash <span class="sx-alloc-pct">$cash_fmt%</span>
+        </div>
+    </div>
+</div>
+""")
+
+_PORTFOLIO_TMPL = string.Template("""
+<div class="sx-card sx-row-gap" style="height:100%;">
+    <div class="sx-card-label">Portfolio Value</div>
+    <div style="font-family:'JetBrains Mono',monospace; font-size:28px; font-weight:700; color:#e6edf3;">
+        $$$total
+    </div>
+    <div style="font-size:12px; color:#636e7b; margin-top:6px;">
+        Equity $$$equity · Bonds $$$bonds · Cash $$$cash
+    </div>
+</div>
+""")
+
+_ORDER_ROW_TMPL = string.Template("""
+<div class="sx-order-row">
+    <span class="sx-pill $pill_cls">$action</span>
+    <div style="flex:1; min-width:0;">
+        <div style="font-size:14px; font-weight:600; color:#e6edf3;">$asset</div>
+        <div style="font-size:12px; color:#636e7b; margin-top:2px; line-height:1.4;">$reason</div>
+    </div>
+</div>
+""")
+
+
+# The cards below depend only on a handful of numbers, so unchanged data
+# (every rerun between analyses) reuses the formatted HTML
+
+@lru_cache(maxsize=32)
+def _allocation_card(equity, bonds, cash_pct) -> str:
+    return _ALLOC_TMPL.substitute(
+        equity=equity, bonds=bonds, cash=cash_pct,
+        equity_fmt=f"{equity:.1f}", bonds_fmt=f"{bonds:.1f}", cash_fmt=f"{cash_pct:.1f}",
+    )
+
 
-def _base_layout(**kw):
-    """Reusable Plotly layout."""
-    layout = dict(
-        plot_bgcolor=_PLOT_BG,
-        paper_bgcolor=_PAPER_BG,
-        font=_FONT,
-        margin=dict(l=0, r=0, t=0, b=0),
-        showlegend=False,
-        height=220,
+@lru_cache(maxsize=32)
+def _portfolio_card(total_val, eq_val, bd_val, cs_val) -> str:
+    return _PORTFOLIO_TMPL.substitute(
+        total=f"{total_val:,.2f}",
+        equity=f"{eq_val:,.0f}", bonds=f"{bd_val:,.0f}", cash=f"{cs_val:,.0f}",
     )
-    layout.update(kw)
-    return go.Layout(**layout)
 
 
 def render_dashboard():
     api = st.session_state.api
-    settings = api.get_settings()
-    tickers = settings.get("tickers", [])
+    boot = _data.get_dashboard_bootstrap(api)
+    tickers = boot["settings"].get("tickers", [])
 
     # ── Header ────────────────────────────────────────
     h_left, h_mid, h_right = st.columns([3, 1, 1])
@@ -61,6 +182,7 @@ def render_dashboard():
             try:
                 result = api.run_analysis(use_mock=use_mock)
                 st.session_state.result = result
+                st.session_state.result_version = st.session_state.get("settings_version", 0)
                 st.session_state.analysis_count = st.session_state.get("analysis_count", 0) + 1
                 st.toast("Analysis complete!", icon="✅")
             except Exception as e:
@@ -69,7 +191,7 @@ def render_dashboard():
 
     result = st.session_state.result
     if result is None:
-        dash = api.get_dashboard_data()
+        dash = boot["dashboard"]
         if dash.get("status") == "ok":
             result = dash
         else:
@@ -83,33 +205,13 @@ def render_dashboard():
             """, unsafe_allow_html=True)
             return
 
-    # ── Extract data ──────────────────────────────────
-    if "sentiment_score" in result:
-        score = result.get("sentiment_score", 0)
-        label = result.get("overall_sentiment", "Neutral")
-        details = result.get("analysis_details", {})
-        bull = details.get("bullish_count", 0)
-        bear = details.get("bearish_count", 0)
-        flat = details.get("neutral_count", 0)
-        total = details.get("total_items_analyzed", bull + bear + flat)
-        orders = result.get("orders", [])
-        snapshot = result.get("portfolio_snapshot", {})
-        risk_level = result.get("new_risk_level", "Medium")
-        risk_text = result.get("risk_adjustment", "")
-        ts = result.get("timestamp", "—")
-    else:
-        s = result.get("sentiment", {})
-        score = s.get("score", 0)
-        label = s.get("label", "Neutral")
-        bull = s.get("positive", 0)
-        bear = s.get("negative", 0)
-        flat = s.get("neutral", 0)
-        total = s.get("total_headlines", bull + bear + flat)
-        orders = result.get("orders", [])
-        snapshot = result.get("allocation", {})
-        risk_level = result.get("risk_preference", "medium")
-        risk_text = ""
-        ts = result.get("timestamp", "—")
+    # Settings saved since this result was produced — keep showing it, flagged
+    if st.session_state.result is not None and (
+        st.session_state.get("result_version", 0) != st.session_state.get("settings_version", 0)
+    ):
+        st.info("Settings changed since this analysis — press **Run Analysis** to refresh.")
+
+    v = _view(result)
 
     # ── KPI strip ─────────────────────────────────────
     # Timestamp banner
@@ -118,213 +220,38 @@ def render_dashboard():
         f'<div style="display:flex; justify-content:space-between; align-items:center; '
         f'padding:8px 14px; background:#111820; border:1px solid #1b2332; border-radius:8px; '
         f'margin-bottom:8px; font-size:12px;">'
-        f'<span style="color:#636e7b;">Last updated <span style="color:#8b949e; font-weight:600;">{ts}</span></span>'
-        f'<span style="color:#3d4752;">Run #{run_num} · {total} headlines analyzed</span>'
+        f'<span style="color:#636e7b;">Last updated <span style="color:#8b949e; font-weight:600;">{v["ts"]}</span></span>'
+        f'<span style="color:#3d4752;">Run #{run_num} · {v["total"]} headlines analyzed</span>'
         f'</div>',
         unsafe_allow_html=True,
     )
 
     k1, k2, k3, k4, k5 = st.columns(5)
-    k1.metric("Headlines", total)
-    k2.metric("Bullish", bull, delta=f"{(bull/total*100):.0f}%" if total else None, delta_color="normal")
-    k3.metric("Bearish", bear, delta=f"{(bear/total*100):.0f}%" if total else None, delta_color="inverse")
-    k4.metric("Neutral", flat)
-    score_sign = "+" if score > 0 else ""
-    k5.metric("Score", f"{score_sign}{score:.3f}", delta=label, delta_color="normal" if score > 0.05 else ("inverse" if score < -0.05 else "off"))
-
-    # ── Row 1 — Sentiment gauge · Breakdown donut ────
-    st.markdown("")
-    col_gauge, col_donut = st.columns([3, 2])
-
-    with col_gauge:
-        color = _GREEN if score > 0.05 else (_RED if score < -0.05 else _GRAY)
-        pct = max(0, min(100, ((score + 1) / 2) * 100))
-
-        # Gradient fill from left to the needle position
-        if score > 0.05:
-            fill_grad = f"linear-gradient(90deg, #1b2332 0%, {_GREEN}44 {pct}%)"
-        elif score < -0.05:
-            fill_grad = f"linear-gradient(90deg, {_RED}44 0%, #1b2332 {pct}%)"
-        else:
-            fill_grad = "#1b2332"
-
-        st.markdown(f"""
-        <div class="sx-card">
-            <div class="sx-card-label">Market Sentiment</div>
-            <div style="display:flex; align-items:baseline; gap:10px;">
-                <div class="sx-score" style="color:{color}">{score_sign}{score:.3f}</div>
-                <div class="sx-score-label" style="color:{color}">{label}</div>
-            </div>
-            <div class="sx-gauge-track" style="background:{fill_grad}; margin-top:22px;">
-                <div class="sx-gauge-needle" style="left:{pct}%; background:{color};"></div>
-            </div>
-            <div class="sx-gauge-ticks">
-                <span>-1.0 Bearish</span>
-                <span>0.0</span>
-                <span>+1.0 Bullish</span>
-            </div>
-            <div style="margin-top:14px; font-size:12px; color:#636e7b;">
-                Based on {total} headlines from Finnhub, NewsAPI & Reddit · {ts}
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
-
-    with col_donut:
-        # Plotly donut chart for sentiment breakdown
-        fig = go.Figure(data=[go.Pie(
-            labels=["Bullish", "Bearish", "Neutral"],
-            values=[bull, bear, flat],
-            hole=0.65,
-            marker=dict(colors=[_GREEN, _RED, _GRAY], line=dict(color="#0a0e17", width=2)),
-            textinfo="none",
-            hoverinfo="label+value+percent",
-        )])
-        fig.update_layout(
-            _base_layout(height=260),
-            annotations=[dict(
-                text=f"<b>{total}</b><br><span style='font-size:11px; color:#636e7b'>items</span>",
-                x=0.5, y=0.5, font_size=20, font_color="#e6edf3", showarrow=False,
-            )],
-            legend=dict(
-                orientation="h", y=-0.05, x=0.5, xanchor="center",
-                font=dict(size=11, color="#8b949e"),
-            ),
-            showlegend=True,
-        )
-        st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
+    for col, (label, value, delta, delta_color) in zip((k1, k2, k3, k4, k5), v["kpis"]):
+        col.metric(label, value, delta=delta, delta_color=delta_color)
+
+    # ── Row 1 — Sentiment gauge ──────────────────────
+    st.markdown(v["gauge_html"], unsafe_allow_html=True)
 
     # ── Row 2 — Risk · Allocation · Portfolio ─────────
-    st.markdown("")
     col_risk, col_alloc, col_port = st.columns(3)
-
-    # Risk level
     with col_risk:
-        risk_map = {
-            "high": ("High", "Aggressive positioning", _RED),
-            "medium": ("Medium", "Balanced exposure", _BLUE),
-            "low": ("Low", "Defensive posture", _GREEN),
-            "High": ("High", "Aggressive positioning", _RED),
-            "Medium": ("Medium", "Balanced exposure", _BLUE),
-            "Low": ("Low", "Defensive posture", _GREEN),
-        }
-        r_name, r_desc, r_color = risk_map.get(risk_level, risk_map["medium"])
-
-        st.markdown(f"""
-        <div class="sx-card" style="height:100%;">
-            <div class="sx-card-label">Risk Level</div>
-            <div class="sx-risk-badge" style="color:{r_color}; background:{r_color}18; margin-bottom:10px;">
-                <span style="width:10px; height:10px; background:{r_color}; border-radius:50%; display:inline-block;"></span>
-                {r_name}
-            </div>
-            <div style="font-size:13px; color:#8b949e; margin-bottom:6px;">{r_desc}</div>
-            <div style="font-size:12px; color:#4b5563; line-height:1.5;">{risk_text}</div>
-        </div>
-        """, unsafe_allow_html=True)
-
-    # Allocation bar
+        st.markdown(v["risk_html"], unsafe_allow_html=True)
     with col_alloc:
-        equity = snapshot.get("equity_pct", 0)
-        bonds = snapshot.get("bonds_pct", 0)
-        cash_pct = snapshot.get("cash_pct", 0)
-
-        st.markdown(f"""
-        <div class="sx-card" style="height:100%;">
-            <div class="sx-card-label">Target Allocation</div>
-            <div class="sx-alloc-bar">
-                <div style="width:{equity}%; background:{_BLUE}; border-radius:5px 0 0 5px;"></div>
-                <div style="width:{bonds}%; background:{_PURPLE};"></div>
-                <div style="width:{cash_pct}%; background:#2d333b; border-radius:0 5px 5px 0;"></div>
-            </div>
-            <div style="display:flex; gap:20px; flex-wrap:wrap;">
-                <div class="sx-alloc-item">
-                    <div class="sx-alloc-dot" style="background:{_BLUE};"></div>
-                    Equity <span class="sx-alloc-pct">{equity:.1f}%</span>
-                </div>
-                <div class="sx-alloc-item">
-                    <div class="sx-alloc-dot" style="background:{_PURPLE};"></div>
-                    Bonds <span class="sx-alloc-pct">{bonds:.1f}%</span>
-                </div>
-                <div class="sx-alloc-item">
-                    <div class="sx-alloc-dot" style="background:#2d333b;"></div>
-                    Cash <span class="sx-alloc-pct">{cash_pct:.1f}%</span>
-                </div>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
-
-    # Portfolio value
+        st.markdown(v["alloc_html"], unsafe_allow_html=True)
     with col_port:
-        total_val = snapshot.get("total_value", 0)
-
-        st.markdown(f"""
-        <div class="sx-card" style="height:100%;">
-            <div class="sx-card-label">Portfolio Value</div>
-            <div style="font-family:'JetBrains Mono',monospace; font-size:28px; font-weight:700; color:#e6edf3;">
-                ${total_val:,.2f}
-            </div>
-            <div style="font-size:12px; color:#636e7b; margin-top:6px;">
-                Equity ${total_val * equity / 100:,.0f} · Bonds ${total_val * bonds / 100:,.0f} · Cash ${total_val * cash_pct / 100:,.0f}
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(v["port_html"], unsafe_allow_html=True)
 
     # ── Row 3 — Orders ───────────────────────────────
-    if orders:
-        st.markdown("")
-        st.markdown(
-            '<div class="sx-card"><div class="sx-card-label">Trade Recommendations</div>',
-            unsafe_allow_html=True,
-        )
-
-        for o in orders:
-            action = (o.get("action", "HOLD")).upper()
-            pill_cls = "sx-pill-buy" if action == "BUY" else ("sx-pill-sell" if action == "SELL" else "sx-pill-hold")
-            asset = o.get("asset", "—")
-            reason = o.get("reason", "")
-
-            st.markdown(f"""
-            <div class="sx-order-row">
-                <span class="sx-pill {pill_cls}">{action}</span>
-                <div style="flex:1; min-width:0;">
-                    <div style="font-size:14px; font-weight:600; color:#e6edf3;">{asset}</div>
-                    <div style="font-size:12px; color:#636e7b; margin-top:2px; line-height:1.4;">{reason}</div>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
-
-        st.markdown("</div>", unsafe_allow_html=True)
-
-    # ── Row 4 — Sentiment breakdown bar chart ─────────
-    if bull or bear or flat:
-        st.markdown("")
-        fig_bar = go.Figure()
-        fig_bar.add_trace(go.Bar(
-            x=["Bullish", "Bearish", "Neutral"],
-            y=[bull, bear, flat],
-            marker_color=[_GREEN, _RED, _GRAY],
-            marker_line_color="#0a0e17",
-            marker_line_width=1,
-            text=[bull, bear, flat],
-            textposition="outside",
-            textfont=dict(size=13, color="#c9d1d9", family="JetBrains Mono"),
-        ))
-        fig_bar.update_layout(
-            _base_layout(height=200),
-            xaxis=dict(
-                color=_TEXT_COLOR, showgrid=False,
-                tickfont=dict(size=12),
-            ),
-            yaxis=dict(
-                color=_TEXT_COLOR, showgrid=True, gridcolor=_GRID_COLOR,
-                zeroline=False, tickfont=dict(size=11),
-            ),
-            margin=dict(l=0, r=0, t=10, b=30),
-        )
+    if v["orders_html"]:
+        st.markdown(v["orders_html"], unsafe_allow_html=True)
 
+    # ── Row 4 — Sentiment breakdown (donut + bar) ─────
+    if v["fig"] is not None:
         col_bar_l, col_bar_r = st.columns([1, 3])
         with col_bar_l:
             st.markdown("""
-            <div class="sx-card" style="height:100%; display:flex; flex-direction:column; justify-content:center;">
+            <div class="sx-card sx-row-gap" style="height:100%; display:flex; flex-direction:column; justify-content:center;">
                 <div class="sx-card-label">Headline Distribution</div>
                 <div style="font-size:13px; color:#8b949e; line-height:1.6;">
                     Breakdown of sentiment<br>across all analyzed items
@@ -332,4 +259,216 @@ def render_dashboard():
             </div>
             """, unsafe_allow_html=True)
         with col_bar_r:
-            st.plotly_chart(fig_bar, use_container_width=True, config={"displayModeBar": False})
+            st.plotly_chart(v["fig"], use_container_width=True, config={"displayModeBar": False})
+
+
+# ── View building ─────────────────────────────────────
+# Everything derived from `result` — KPI values, card HTML, the Plotly
+# figure — is built once per distinct result and replayed on later reruns
+# (widget clicks, page switches), which only have to re-emit it.
+
+# Canonical bytes for hashing: sorted keys, numpy values and non-str keys allowed
+_HASH_OPTS = orjson.OPT_SORT_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _view(result) -> dict:
+    """Return the built view for `result`, reusing the last one if unchanged."""
+    key = hashlib.md5(orjson.dumps(result, default=str, option=_HASH_OPTS)).hexdigest()
+    memo = st.session_state.get("_dash_view")
+    if memo is not None and memo[0] == key:
+        return memo[1]
+    view = _build_view(result)
+    st.session_state._dash_view = (key, view)
+    return view
+
+
+def _build_view(result) -> dict:
+    e = _extract(result)
+
+    # Derived numbers — computed once and shared by the KPI strip and cards
+    inv_total = (1.0 / e.total) if e.total else 0.0
+    bull_pct = e.bull * 100 * inv_total
+    bear_pct = e.bear * 100 * inv_total
+    eq_val = e.total_val * e.equity * 0.01
+    bd_val = e.total_val * e.bonds * 0.01
+    cs_val = e.total_val * e.cash_pct * 0.01
+
+    # ── KPI strip ─────────────────────────────────────
+    score_sign = "+" if e.score > 0 else ""
+    kpis = (
+        ("Headlines", e.total, None, "normal"),
+        ("Bullish", e.bull, f"{bull_pct:.0f}%" if e.total else None, "normal"),
+        ("Bearish", e.bear, f"{bear_pct:.0f}%" if e.total else None, "inverse"),
+        ("Neutral", e.flat, None, "normal"),
+        ("Score", f"{score_sign}{e.score:.3f}", e.label,
+         "normal" if e.score > 0.05 else ("inverse" if e.score < -0.05 else "off")),
+    )
+
+    # ── Sentiment gauge ───────────────────────────────
+    color = _GREEN if e.score > 0.05 else (_RED if e.score < -0.05 else _GRAY)
+    pct = max(0, min(100, ((e.score + 1) / 2) * 100))
+
+    # Gradient fill from left to the needle position
+    if e.score > 0.05:
+        fill_grad = f"linear-gradient(90deg, #1b2332 0%, {_GREEN}44 {pct}%)"
+    elif e.score < -0.05:
+        fill_grad = f"linear-gradient(90deg, {_RED}44 0%, #1b2332 {pct}%)"
+    else:
+        fill_grad = "#1b2332"
+
+    gauge_html = _GAUGE_TMPL.substitute(
+        color=color, score_sign=score_sign, score=f"{e.score:.3f}", label=e.label,
+        fill_grad=fill_grad, pct=pct, total=e.total, ts=e.ts,
+    )
+
+    # ── Risk level ────────────────────────────────────
+    r_name, r_desc, r_color = _RISK_MAP.get(e.risk_level, _RISK_MAP["medium"])
+    risk_html = _RISK_TMPL.substitute(color=r_color, name=r_name, desc=r_desc, text=e.risk_text)
+
+    # ── Orders ────────────────────────────────────────
+    # One element for the whole card — separate st.markdown calls can't
+    # share an open <div>, and each one is its own render pass
+    orders_html = ""
+    if e.orders:
+        order_html = ['<div class="sx-card sx-row-gap"><div class="sx-card-label">Trade Recommendations</div>']
+        for o in e.orders:
+            action = (o.get("action", "HOLD")).upper()
+            pill_cls = _PILL_CLS.get(action, "sx-pill-hold")
+            asset = o.get("asset", "—")
+            # A blank line ends a Markdown HTML block and an indented line
+            # after one renders as code, so rows are stripped and joined flush
+            # and the free-text reason is kept to a single line
+            reason = " ".join(str(o.get("reason", "")).split())
+
+            order_html.append(_ORDER_ROW_TMPL.substitute(
+                pill_cls=pill_cls, action=action, asset=asset, reason=reason,
+            ).strip())
+        order_html.append("</div>")
+        orders_html = "".join(order_html)
+
+    return {
+        "ts": e.ts,
+        "total": e.total,
+        "kpis": kpis,
+        "gauge_html": gauge_html,
+        "risk_html": risk_html,
+        "alloc_html": _allocation_card(e.equity, e.bonds, e.cash_pct),
+        "port_html": _portfolio_card(e.total_val, eq_val, bd_val, cs_val),
+        "orders_html": orders_html,
+        "fig": _sentiment_figure(e.bull, e.bear, e.flat, e.total) if (e.bull or e.bear or e.flat) else None,
+    }
+
+
+class _Extracted(NamedTuple):
+    """The fields the dashboard reads, from either result shape."""
+    score: float
+    label: str
+    bull: int
+    bear: int
+    flat: int
+    total: int
+    orders: list
+    risk_level: str
+    risk_text: str
+    ts: str
+    equity: float
+    bonds: float
+    cash_pct: float
+    total_val: float
+
+
+def _extract(result) -> _Extracted:
+    if "sentiment_score" in result:
+        # Raw agent result (run_analysis)
+        details = result.get("analysis_details", {})
+        bull = details.get("bullish_count", 0)
+        bear = details.get("bearish_count", 0)
+        flat = details.get("neutral_count", 0)
+        total = details.get("total_items_analyzed", bull + bear + flat)
+        score = result.get("sentiment_score", 0)
+        label = result.get("overall_sentiment", "Neutral")
+        snapshot = result.get("portfolio_snapshot", {})
+        risk_level = result.get("new_risk_level", "Medium")
+        risk_text = result.get("risk_adjustment", "")
+    else:
+        # Flat get_dashboard_data() shape
+        s = result.get("sentiment", {})
+        bull = s.get("positive", 0)
+        bear = s.get("negative", 0)
+        flat = s.get("neutral", 0)
+        total = s.get("total_headlines", bull + bear + flat)
+        score = s.get("score", 0)
+        label = s.get("label", "Neutral")
+        snapshot = result.get("allocation", {})
+        risk_level = result.get("risk_preference", "medium")
+        risk_text = ""
+
+    return _Extracted(
+        score=score, label=label, bull=bull, bear=bear, flat=flat, total=total,
+        orders=result.get("orders", []),
+        risk_level=risk_level, risk_text=risk_text,
+        ts=result.get("timestamp", "—"),
+        equity=snapshot.get("equity_pct", 0),
+        bonds=snapshot.get("bonds_pct", 0),
+        cash_pct=snapshot.get("cash_pct", 0),
+        total_val=snapshot.get("total_value", 0),
+    )
+
+
+def _sentiment_figure(bull, bear, flat, total):
+    """Donut + bar breakdown as one subplot figure — a single Plotly payload
+    and a single chart component per rerun instead of two."""
+    # Imported here so the chat/settings pages and the empty dashboard
+    # never pay plotly's cold import
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    fig = make_subplots(
+        rows=1, cols=2,
+        specs=[[{"type": "domain"}, {"type": "xy"}]],
+        column_widths=[0.4, 0.6],
+        horizontal_spacing=0.08,
+    )
+    fig.add_trace(go.Pie(
+        labels=["Bullish", "Bearish", "Neutral"],
+        values=[bull, bear, flat],
+        hole=0.65,
+        marker=dict(colors=[_GREEN, _RED, _GRAY], line=dict(color="#0a0e17", width=2)),
+        textinfo="none",
+        hoverinfo="label+value+percent",
+    ), row=1, col=1)
+    fig.add_trace(go.Bar(
+        x=["Bullish", "Bearish", "Neutral"],
+        y=[bull, bear, flat],
+        marker_color=[_GREEN, _RED, _GRAY],
+        marker_line_color="#0a0e17",
+        marker_line_width=1,
+        text=[bull, bear, flat],
+        textposition="outside",
+        textfont=dict(size=13, color="#c9d1d9", family="JetBrains Mono"),
+        showlegend=False,
+    ), row=1, col=2)
+
+    # Centre the donut label and legend on the donut's own domain
+    donut = fig.get_subplot(1, 1)
+    donut_x = (donut.x[0] + donut.x[1]) / 2
+    fig.update_layout(**_base_layout(
+        height=260,
+        annotations=[dict(
+            text=f"<b>{total}</b><br><span style='font-size:11px; color:#636e7b'>items</span>",
+            x=donut_x, y=0.5, xref="paper", yref="paper",
+            font_size=20, font_color="#e6edf3", showarrow=False,
+        )],
+        legend=dict(
+            orientation="h", y=-0.05, x=donut_x, xanchor="center",
+            font=dict(size=11, color="#8b949e"),
+        ),
+        showlegend=True,
+        margin=dict(l=0, r=0, t=24, b=30),   # t includes the .sx-row-gap offset
+    ))
+    fig.update_xaxes(color=_TEXT_COLOR, showgrid=False, tickfont=dict(size=12), row=1, col=2)
+    fig.update_yaxes(
+        color=_TEXT_COLOR, showgrid=True, gridcolor=_GRID_COLOR,
+        zeroline=False, tickfont=dict(size=11), row=1, col=2,
+    )
+    return fig
@@ -1,21 +1,88 @@
 """Settings page — configure tickers, portfolio & risk."""
 
+import re
+
 import streamlit as st
 
+from st_pages import _data
+
+MAX_TICKERS = 10
+
+# One symbol per match — covers NSE/BSE suffixes and names like M&M, BAJAJ-AUTO;
+# commas, spaces and stray punctuation between symbols are skipped
+_TICKER_RE = re.compile(r"[A-Za-z0-9^][A-Za-z0-9.&^\-]*")
+
+# API risk level -> widget label, and label -> option index
+_RISK_DISPLAY = {"low": "Conservative", "medium": "Moderate", "high": "Aggressive"}
+_RISK_OPTIONS = ("Conservative", "Moderate", "Aggressive")
+_RISK_INDEX = {label: i for i, label in enumerate(_RISK_OPTIONS)}
+
+# Title + subtitle as one element
+_HEADER_HTML = (
+    '<div style="font-size:22px; font-weight:700; color:#e6edf3; margin-bottom:2px;">Settings</div>'
+    '<div style="font-size:13px; color:#636e7b; margin-bottom:20px;">Configure your watchlist, portfolio size, and risk preference</div>'
+)
+
+# Static right-column card — built once at import
+_ABOUT_HTML = """
+<div class="sx-card">
+    <div class="sx-card-label">About SentXStock</div>
+
+    <div class="sx-about-item">
+        <div class="sx-about-label">Sentiment Pipeline</div>
+        <div class="sx-about-value">
+            <span style="color:#3fb950;">FinBERT</span> (local ML) →
+            <span style="color:#1f6feb;">Gemini 2.0-flash</span> (LLM) →
+            <span style="color:#d29922;">VADER</span> (fallback)
+        </div>
+    </div>
+
+    <div class="sx-about-item">
+        <div class="sx-about-label">Data Sources</div>
+        <div class="sx-about-value">Finnhub news · NewsAPI (80 k+ sources) · Reddit (WSB, r/stocks, r/investing)</div>
+    </div>
+
+    <div class="sx-about-item">
+        <div class="sx-about-label">Risk Profiles</div>
+        <div class="sx-about-value" style="font-family:'JetBrains Mono',monospace; font-size:12px;">
+            <div style="display:flex; gap:8px; margin-bottom:4px;">
+                <span style="color:#3fb950; width:96px;">Conservative</span>
+                <span>30% equity · 50% bonds · 20% cash</span>
+            </div>
+            <div style="display:flex; gap:8px; margin-bottom:4px;">
+                <span style="color:#1f6feb; width:96px;">Moderate</span>
+                <span>60% equity · 30% bonds · 10% cash</span>
+            </div>
+            <div style="display:flex; gap:8px;">
+                <span style="color:#f85149; width:96px;">Aggressive</span>
+                <span>80% equity · 10% bonds · 10% cash</span>
+            </div>
+        </div>
+    </div>
+
+    <div class="sx-about-item" style="border-bottom:none;">
+        <div class="sx-about-label">Project</div>
+        <div class="sx-about-value">
+            NAAC Hackathon 2026 · 
+            <a href="https://github.com/RajendharAre/SentXStock" target="_blank" 
+               style="color:#1f6feb; text-decoration:none;">GitHub ↗</a>
+        </div>
+    </div>
+</div>
+"""
+
+
+def _bump_settings_version():
+    """Mark the session's last dashboard result as stale without discarding it."""
+    st.session_state.settings_version = st.session_state.get("settings_version", 0) + 1
+
 
 def render_settings():
     api = st.session_state.api
-    settings = api.get_settings()
+    settings = _data.get_settings(api)
 
     # ── Header ────────────────────────────────────────
-    st.markdown(
-        '<div style="font-size:22px; font-weight:700; color:#e6edf3; margin-bottom:2px;">Settings</div>',
-        unsafe_allow_html=True,
-    )
-    st.markdown(
-        '<div style="font-size:13px; color:#636e7b; margin-bottom:20px;">Configure your watchlist, portfolio size, and risk preference</div>',
-        unsafe_allow_html=True,
-    )
+    st.markdown(_HEADER_HTML, unsafe_allow_html=True)
 
     col_left, col_right = st.columns([3, 2])
 
@@ -26,20 +93,29 @@ def render_settings():
             '<div class="sx-card"><div class="sx-card-label">Watchlist</div></div>',
             unsafe_allow_html=True,
         )
-        current_tickers = ", ".join(settings.get("tickers", []))
-        tickers_input = st.text_input(
-            "Tickers (comma-separated, max 10)",
-            value=current_tickers,
-            placeholder="AAPL, TSLA, NVDA, MSFT, GOOGL",
-            key="set_tickers",
-        )
-        if st.button("Save Watchlist", key="btn_tickers"):
-            tickers = [t.strip().upper() for t in tickers_input.split(",") if t.strip()]
+        # Forms hold widget edits client-side until Save, so typing doesn't
+        # rerun the page on every change
+        # The joined watchlist is mirrored in session_state and only rebuilt on Save
+        st.session_state.setdefault("tickers_str", ", ".join(settings.get("tickers", [])))
+        with st.form("watchlist_form", clear_on_submit=False, border=False):
+            tickers_input = st.text_input(
+                "Tickers (comma-separated, max 10)",
+                value=st.session_state.tickers_str,
+                placeholder="AAPL, TSLA, NVDA, MSFT, GOOGL",
+                key="set_tickers",
+            )
+            save_tickers = st.form_submit_button("Save Watchlist")
+        if save_tickers:
+            tickers = [m.group(0).upper() for m in _TICKER_RE.finditer(tickers_input)]
+            if len(tickers) > MAX_TICKERS:
+                st.info(f"Only the first {MAX_TICKERS} tickers were kept.")
+                tickers = tickers[:MAX_TICKERS]
             if tickers:
                 result = api.set_user_tickers(tickers)
                 if result.get("success"):
+                    st.session_state.tickers_str = ", ".join(result["tickers"])
                     api.reset_results()             # wipe _latest_result + _initialized
-                    st.session_state.result = None  # wipe Streamlit cache
+                    _bump_settings_version()
                     st.success(f"✅ Watchlist updated — {', '.join(tickers)}")
                     st.info("📈 Go to Dashboard and press Run Analysis to see new results.")
                 else:
@@ -55,33 +131,34 @@ def render_settings():
             unsafe_allow_html=True,
         )
 
-        p1, p2 = st.columns(2)
-        with p1:
-            cash = st.number_input(
-                "Investment ($)",
-                min_value=1000,
-                max_value=10_000_000,
-                value=int(settings.get("cash", 50000)),
-                step=5000,
-                format="%d",
-                key="set_cash",
-            )
-        with p2:
-            risk_display = {"low": "Conservative", "medium": "Moderate", "high": "Aggressive"}
-            risk_options = ["Conservative", "Moderate", "Aggressive"]
-            current_risk = risk_display.get(settings.get("risk_preference", "medium"), "Moderate")
-            risk = st.selectbox(
-                "Risk Preference",
-                risk_options,
-                index=risk_options.index(current_risk),
-                key="set_risk",
-            )
+        with st.form("portfolio_form", clear_on_submit=False, border=False):
+            p1, p2 = st.columns(2)
+            with p1:
+                cash = st.number_input(
+                    "Investment ($)",
+                    min_value=1000,
+                    max_value=10_000_000,
+                    value=int(settings.get("cash", 50000)),
+                    step=5000,
+                    format="%d",
+                    key="set_cash",
+                )
+            with p2:
+                current_risk = _RISK_DISPLAY.get(settings.get("risk_preference", "medium"), "Moderate")
+                risk = st.radio(
+                    "Risk Preference",
+                    _RISK_OPTIONS,
+                    index=_RISK_INDEX.get(current_risk, 1),
+                    horizontal=True,
+                    key="set_risk",
+                )
+            save_portfolio = st.form_submit_button("Save Portfolio")
 
-        if st.button("Save Portfolio", key="btn_portfolio"):
+        if save_portfolio:
             result = api.set_user_portfolio(cash=float(cash), risk=risk)
             if result.get("success"):
                 api.reset_results()             # wipe _latest_result + _initialized
-                st.session_state.result = None  # wipe Streamlit cache
+                _bump_settings_version()
                 st.success(f"✅ {result.get('message', 'Portfolio updated')}")
                 st.info("📈 Go to Dashboard and press Run Analysis to see updated results.")
             else:
@@ -89,49 +166,4 @@ def render_settings():
 
     # ── Right column — About + Quick reference ────────
     with col_right:
-        st.markdown("""
-        <div class="sx-card">
-            <div class="sx-card-label">About SentXStock</div>
-
-            <div class="sx-about-item">
-                <div class="sx-about-label">Sentiment Pipeline</div>
-                <div class="sx-about-value">
-                    <span style="color:#3fb950;">FinBERT</span> (local ML) →
-                    <span style="color:#1f6feb;">Gemini 2.0-flash</span> (LLM) →
-                    <span style="color:#d29922;">VADER</span> (fallback)
-                </div>
-            </div>
-
-            <div class="sx-about-item">
-                <div class="sx-about-label">Data Sources</div>
-                <div class="sx-about-value">Finnhub news · NewsAPI (80 k+ sources) · Reddit (WSB, r/stocks, r/investing)</div>
-            </div>
-
-            <div class="sx-about-item">
-                <div class="sx-about-label">Risk Profiles</div>
-                <div class="sx-about-value" style="font-family:'JetBrains Mono',monospace; font-size:12px;">
-                    <div style="display:flex; gap:8px; margin-bottom:4px;">
-                        <span style="color:#3fb950; width:96px;">Conservative</span>
-                        <span>30% equity · 50% bonds · 20% cash</span>
-                    </div>
-                    <div style="display:flex; gap:8px; margin-bottom:4px;">
-                        <span style="color:#1f6feb; width:96px;">Moderate</span>
-                        <span>60% equity · 30% bonds · 10% cash</span>
-                    </div>
-                    <div style="display:flex; gap:8px;">
-                        <span style="color:#f85149; width:96px;">Aggressive</span>
-                        <span>80% equity · 10% bonds · 10% cash</span>
-                    </div>
-                </div>
-            </div>
-
-            <div class="sx-about-item" style="border-bottom:none;">
-                <div class="sx-about-label">Project</div>
-                <div class="sx-about-value">
-                    NAAC Hackathon 2026 · 
-                    <a href="https://github.com/RajendharAre/SentXStock" target="_blank" 
-                       style="color:#1f6feb; text-decoration:none;">GitHub ↗</a>
-                </div>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_ABOUT_HTML, unsafe_allow_html=True)
@@ -0,0 +1,55 @@
+"""Prefilter routing in SentimentAnalyzer — worded texts reach FinBERT."""
+
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("transformers")
+
+from sentiment.analyzer import PREFILTER_CONFIDENCE, SentimentAnalyzer
+from sentiment.scorer import SentimentScorer
+
+
+class _RecordingFinBERT:
+    def __init__(self):
+        self.seen = []
+
+    def analyze(self, text):
+        return self.analyze_batch([text])[0]
+
+    def analyze_batch(self, texts):
+        self.seen.extend(texts)
+        return [{"text": t, "sentiment": "Bullish", "score": 0.9, "confidence": 0.95} for t in texts]
+
+
+@pytest.fixture
+def analyzer():
+    # Skip __init__: no model download, no Gemini keys
+    a = SentimentAnalyzer.__new__(SentimentAnalyzer)
+    a.scorer = SentimentScorer()
+    a.finbert = _RecordingFinBERT()
+    a.finbert_available = True
+    a.llm_available = False
+    return a
+
+
+@pytest.mark.parametrize("text", ["TSLA up", "Crash!", "Bullish"])
+def test_short_worded_text_goes_to_finbert(analyzer, text):
+    [result] = analyzer.analyze_batch([text])
+    assert result["method"] == "finbert"
+    assert analyzer.finbert.seen == [text]
+    assert analyzer.analyze_single(text)["method"] == "finbert"
+
+
+@pytest.mark.parametrize("text", ["", "RT @foo: $TSLA", "🚀🚀🚀", "https://t.co/abc $NVDA #AI"])
+def test_wordless_text_is_prefiltered(analyzer, text):
+    [result] = analyzer.analyze_batch([text])
+    assert result["method"] == "prefilter"
+    assert result["confidence"] == PREFILTER_CONFIDENCE
+    assert analyzer.finbert.seen == []
+    assert analyzer.analyze_single(text)["method"] == "prefilter"
+
+
+def test_batch_keeps_input_order(analyzer):
+    results = analyzer.analyze_batch(["RT @foo: $TSLA", "TSLA up", "🚀🚀🚀"])
+    assert [r["method"] for r in results] == ["prefilter", "finbert", "prefilter"]
+    assert analyzer.finbert.seen == ["TSLA up"]